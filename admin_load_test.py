@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Admin Concurrency Test
+Logs many operators in at once, then runs their mixed admin writes against a
+live display read load and reports login latency, session store growth and how
+much the writes slow the display down
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from test_selenium import Colors, HttpBenchmark, LatencyStats, NavyDisplayTester, TestResults, find_server_pid
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+# What a display screen keeps fetching while operators work in /admin
+DISPLAY_ENDPOINTS = ["/notices", "/documents", "/duty-officers"]
+
+class Operator:
+    """One admin user with its own cookie jar and a personnel record of its own to edit"""
+
+    def __init__(self, test, number):
+        self.test = test
+        self.number = number
+        self.session = requests.Session()
+        self.personnel_id = None
+
+    def timed(self, operation, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{self.test.api_url}{path}", timeout=self.test.timeout, **kwargs)
+            ok = response.status_code < 400
+        except requests.exceptions.RequestException:
+            response, ok = None, False
+        self.test.stats_for(operation).add(time.perf_counter() - started if response is not None else None, ok)
+        return response if ok else None
+
+    def login(self):
+        response = self.timed("login", "POST", "/admin/login", json=NavyDisplayTester.ADMIN_CREDENTIALS)
+        if response is None or not response.json().get('success'):
+            return False
+        session = self.timed("session check", "GET", "/admin/session")
+        return session is not None and session.json().get('authenticated')
+
+    def logout(self):
+        self.timed("logout", "POST", "/admin/logout")
+        self.session.close()
+
+    # Workloads
+
+    def notice_crud(self):
+        now = datetime.now(timezone.utc)
+        created = self.timed("notice create", "POST", "/notices", json={
+            'title': f"Aviso de carga do operador {self.number}",
+            'content': "Aviso criado pelo teste de concorrência administrativa.",
+            'priority': random.choice(["high", "medium", "low"]),
+            'startDate': (now - timedelta(hours=1)).isoformat(),
+            'endDate': (now + timedelta(hours=1)).isoformat(),
+            'active': False,
+        })
+        if created is None:
+            return
+        notice_id = created.json()['notice']['id']
+        self.timed("notice update", "PUT", f"/notices/{notice_id}", json={
+            'content': f"Aviso atualizado às {now.strftime('%H:%M:%S')}.",
+        })
+        self.timed("notice delete", "DELETE", f"/notices/{notice_id}")
+
+    def duty_officers(self):
+        # Rewrites the current officers: a real write and broadcast, but the screens show the same names
+        self.timed("duty-officers PUT", "PUT", "/duty-officers", json=self.test.duty_officers)
+
+    def personnel_edit(self):
+        if self.personnel_id is None:
+            created = self.timed("personnel create", "POST", "/military-personnel", json={
+                'name': f"OPERADOR DE CARGA {self.number}", 'rank': "1t", 'type': "officer",
+                'fullRankName': "Primeiro-Tenente", 'specialty': None, 'active': False,
+            })
+            if created is None:
+                return
+            self.personnel_id = created.json()['data']['id']
+            self.test.created_personnel.append(self.personnel_id)
+        self.timed("personnel edit", "PUT", f"/military-personnel/{self.personnel_id}", json={
+            'specialty': random.choice(["IM", "CA", "AA", "FN"]),
+        })
+
+    def work(self, deadline):
+        workloads = [getattr(self, name) for name in self.test.mix_order]
+        while time.perf_counter() < deadline:
+            random.choice(workloads)()
+            time.sleep(random.uniform(0, 2 * self.test.think))
+
+class AdminConcurrencyTest:
+    """Baseline display reads, a login burst, then admin writes over the same display reads"""
+
+    WORKLOADS = {
+        'notice': "notice_crud",
+        'duty': "duty_officers",
+        'personnel': "personnel_edit",
+    }
+
+    def __init__(self, base_url, operators=20, display_clients=10, duration=30, mix=None, think=0.5,
+                 login_rounds=3, max_slowdown=None, timeout=30):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.operator_count = operators
+        self.display_clients = display_clients
+        self.duration = duration
+        self.mix = mix or {'notice': 2, 'duty': 1, 'personnel': 2}
+        # Weighted choice by repetition keeps Operator.work a plain random.choice
+        self.mix_order = [self.WORKLOADS[name] for name, weight in self.mix.items() for _ in range(weight)]
+        self.think = think
+        self.login_rounds = login_rounds
+        self.max_slowdown = max_slowdown
+        self.timeout = timeout
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.operators = []
+        self.created_personnel = []
+        self.duty_officers = None
+        self.session_store = []
+        self.display = {}
+        self.results = TestResults()
+
+    def stats_for(self, operation):
+        with self._lock:
+            return self.stats.setdefault(operation, LatencyStats())
+
+    # Session store
+
+    def session_store_size(self, label):
+        """Rows in the connect-pg-simple table and server RSS (MemoryStore keeps sessions in the process)"""
+        sample = {'label': label, 'rows': None, 'rss_mb': None}
+        database_url = os.environ.get("DATABASE_URL")
+        if psycopg2 and database_url:
+            try:
+                connection = psycopg2.connect(database_url)
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT count(*) FROM "session"')
+                        sample['rows'] = cursor.fetchone()[0]
+                finally:
+                    connection.close()
+            except psycopg2.Error:
+                pass
+        pid = find_server_pid(self.base_url)
+        if pid:
+            try:
+                sample['rss_mb'] = psutil.Process(pid).memory_info().rss / (1024 * 1024)
+            except psutil.Error:
+                pass
+        self.session_store.append(sample)
+
+    # Phases
+
+    def display_load(self):
+        return HttpBenchmark(self.api_url, DISPLAY_ENDPOINTS, self.display_clients, self.duration, timeout=self.timeout)
+
+    def login_burst(self):
+        """Every round, all operators log in at the same instant with fresh cookie jars, like new browsers"""
+        for round_number in range(1, self.login_rounds + 1):
+            operators = [Operator(self, n) for n in range(1, self.operator_count + 1)]
+            barrier = threading.Barrier(len(operators))
+
+            def login(operator):
+                barrier.wait()
+                return operator.login()
+
+            with ThreadPoolExecutor(max_workers=len(operators)) as executor:
+                logged_in = list(executor.map(login, operators))
+            self.session_store_size(f"after login round {round_number}")
+            failed = logged_in.count(False)
+            self.results.add_result(
+                f"Admin Login: round {round_number}", failed == 0,
+                f"{len(operators) - failed}/{len(operators)} operators authenticated"
+            )
+            # The last round's sessions stay open for the mixed workload
+            if round_number < self.login_rounds:
+                for operator in operators:
+                    operator.session.close()
+            else:
+                self.operators = [operator for operator, ok in zip(operators, logged_in) if ok]
+
+    def mixed_workload(self):
+        benchmark = self.display_load()
+        deadline = time.perf_counter() + self.duration
+        with ThreadPoolExecutor(max_workers=max(1, len(self.operators))) as executor:
+            for operator in self.operators:
+                executor.submit(operator.work, deadline)
+            summaries = benchmark.run()
+        return summaries
+
+    def cleanup(self):
+        session = requests.Session()
+        for personnel_id in self.created_personnel:
+            try:
+                session.delete(f"{self.api_url}/military-personnel/{personnel_id}", timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                print(f"{Colors.RED}Could not delete test personnel {personnel_id}{Colors.END}")
+        for operator in self.operators:
+            operator.logout()
+        self.session_store_size("after logout")
+
+    def run(self):
+        response = requests.get(f"{self.api_url}/duty-officers", timeout=self.timeout)
+        response.raise_for_status()
+        officers = response.json().get('officers') or {}
+        self.duty_officers = {key: officers.get(key) for key in ("officerName", "masterName", "officerRank", "masterRank")}
+
+        self.session_store_size("before")
+        print(f"{Colors.YELLOW}Display reads alone for {self.duration:g}s ({self.display_clients} clients)...{Colors.END}")
+        self.display['baseline'] = self.display_load().run()
+
+        print(f"{Colors.YELLOW}Logging in {self.operator_count} operators x {self.login_rounds} round(s)...{Colors.END}")
+        self.login_burst()
+
+        print(f"{Colors.YELLOW}Admin writes from {len(self.operators)} operators over display reads "
+              f"for {self.duration:g}s...{Colors.END}")
+        try:
+            self.display['with admin writes'] = self.mixed_workload()
+        finally:
+            self.cleanup()
+        self.evaluate()
+
+    # Analysis
+
+    def slowdown(self, key):
+        baseline = self.display['baseline']['overall'][key]
+        loaded = self.display['with admin writes']['overall'][key]
+        return loaded / baseline if baseline else None
+
+    def evaluate(self):
+        summaries = {operation: stats.summary(self.duration) for operation, stats in self.stats.items()}
+        for operation, summary in summaries.items():
+            if operation in ("login", "session check", "logout"):
+                continue
+            self.results.add_result(
+                f"Admin Write: {operation}", summary['errors'] == 0,
+                f"{summary['requests']} requests, {summary['errors']} failed, p95 {summary['p95_ms']:.0f} ms"
+            )
+        if 'with admin writes' in self.display:
+            loaded = self.display['with admin writes']['overall']
+            ratio = self.slowdown('p95_ms')
+            passed = loaded['errors'] == 0 and (
+                self.max_slowdown is None or ratio is None or ratio <= self.max_slowdown
+            )
+            detail = f"p95 {loaded['p95_ms']:.0f} ms"
+            if ratio is not None:
+                detail += f", {ratio:.2f}x the reads-only baseline"
+            self.results.add_result("Display Reads: under admin writes", passed, detail)
+        self.results.add_benchmark("admin operations", summaries)
+        self.results.add_benchmark("display reads", {
+            phase: summary['overall'] for phase, summary in self.display.items()
+        })
+        self.results.add_series("admin session store", self.session_store)
+
+    def print_report(self):
+        def fmt(value, digits=0):
+            return "-" if value is None else f"{value:.{digits}f}"
+
+        print(f"\n{Colors.BLUE}Admin Operations ({self.operator_count} operators){Colors.END}")
+        print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+        print(f"{'Operation':<20}{'Reqs':>7}{'Err':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'Max ms':>9}")
+        for operation, stats in self.stats.items():
+            summary = stats.summary(self.duration)
+            color = Colors.RED if summary['errors'] else Colors.END
+            print(f"{color}{operation:<20}{summary['requests']:>7}{summary['errors']:>6}{summary['p50_ms']:>9.1f}"
+                  f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}{summary['max_ms']:>9.1f}{Colors.END}")
+
+        print(f"\n{Colors.BLUE}Session Store{Colors.END}")
+        print(f"{'When':<24}{'Rows':>8}{'Server RSS MB':>15}")
+        for sample in self.session_store:
+            print(f"{sample['label']:<24}{fmt(sample['rows']):>8}{fmt(sample['rss_mb'], 1):>15}")
+        if all(sample['rows'] is None for sample in self.session_store):
+            print(f"{Colors.YELLOW}Session rows need psycopg2 and DATABASE_URL; without a database the server "
+                  f"uses MemoryStore, which shows up in RSS{Colors.END}")
+
+        if len(self.display) == 2:
+            print(f"\n{Colors.BLUE}Display Reads ({self.display_clients} clients){Colors.END}")
+            print(f"{'Phase':<20}{'Req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'Err%':>7}")
+            for phase, summary in self.display.items():
+                overall = summary['overall']
+                print(f"{phase:<20}{overall['throughput']:>9.1f}{overall['p50_ms']:>9.1f}{overall['p95_ms']:>9.1f}"
+                      f"{overall['p99_ms']:>9.1f}{overall['error_rate'] * 100:>6.1f}%")
+            print(f"Slowdown from admin writes: p50 {fmt(self.slowdown('p50_ms'), 2)}x, "
+                  f"p95 {fmt(self.slowdown('p95_ms'), 2)}x")
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in AdminConcurrencyTest.WORKLOADS:
+            raise ValueError(name)
+        mix[name] = int(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Navy Display System - Admin Concurrency Test. Test notices and personnel are created "
+                    "inactive and removed afterwards; duty officers are rewritten with their current values."
+    )
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--operators", type=int, default=20, metavar="N",
+                        help="Admin users logging in and working at once (default: 20)")
+    parser.add_argument("--display-clients", type=int, default=10, metavar="N",
+                        help="Concurrent display readers (default: 10)")
+    parser.add_argument("--duration", type=float, default=30, metavar="SECONDS",
+                        help="Length of the reads-only baseline and of the mixed phase (default: 30)")
+    parser.add_argument("--mix", default="notice=2,duty=1,personnel=2", metavar="WEIGHTS",
+                        help="Relative weight of each admin workload (default: notice=2,duty=1,personnel=2)")
+    parser.add_argument("--think", type=float, default=0.5, metavar="SECONDS",
+                        help="Mean pause between an operator's actions (default: 0.5)")
+    parser.add_argument("--login-rounds", type=int, default=3, metavar="N",
+                        help="Times every operator logs in with a fresh cookie jar (default: 3)")
+    parser.add_argument("--max-slowdown", type=float, metavar="RATIO",
+                        help="Fail if display read p95 under admin writes exceeds this multiple of the baseline")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and measurements to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError:
+        parser.error(f"--mix takes {', '.join(AdminConcurrencyTest.WORKLOADS)} with integer weights")
+    if not mix or args.operators < 1 or args.login_rounds < 1:
+        parser.error("--mix, --operators and --login-rounds must not be empty or zero")
+
+    print(f"{Colors.CYAN}Navy Display System - Admin Concurrency Test{Colors.END}")
+    print(f"{Colors.CYAN}{'='*44}{Colors.END}")
+
+    test = AdminConcurrencyTest(
+        args.base_url, args.operators, args.display_clients, args.duration, mix, args.think, args.login_rounds,
+        args.max_slowdown
+    )
+    try:
+        test.run()
+    except Exception as e:
+        test.results.add_result("Admin Concurrency: setup", False, str(e))
+    test.print_report()
+    test.results.print_summary()
+    if args.json:
+        test.results.export_json(args.json)
+    sys.exit(0 if test.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
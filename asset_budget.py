@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Asset Budget Check
+Loads each route in a fresh, uncached browser page, lists everything it fetched
+through the Resource Timing API and holds transfer size and request counts per
+resource type against per-route budgets
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from urllib.parse import urlsplit
+
+from test_selenium import Colors, NavyDisplayTester, TestResults
+
+# The default buffer of 250 entries fills up before the display is done loading insignias
+RESOURCE_BUFFER_JS = "performance.setResourceTimingBufferSize(5000);"
+
+COLLECT_RESOURCES_JS = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource')).map(function (e) {
+    return {
+        url: e.name,
+        initiator: e.initiatorType || 'navigation',
+        transfer: e.transferSize,
+        encoded: e.encodedBodySize,
+        decoded: e.decodedBodySize,
+        duration: e.duration
+    };
+});
+"""
+
+EXTENSION_KINDS = {
+    'script': {".js", ".mjs", ".jsx", ".ts", ".tsx"},
+    'stylesheet': {".css"},
+    'image': {".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".avif"},
+    'font': {".woff", ".woff2", ".ttf", ".otf"},
+    'pdf': {".pdf"},
+}
+
+INITIATOR_KINDS = {'script': "script", 'link': "stylesheet", 'css': "image", 'img': "image", 'navigation': "document"}
+
+# Kinds that compress well; if one of these arrives as large as it decodes, nothing compressed it
+TEXT_KINDS = {"document", "script", "stylesheet", "api"}
+
+# Per route and resource kind; "total" covers everything the route loaded. Transfer
+# sizes are as sent over the wire with the cache disabled, so they match a first visit
+DEFAULT_BUDGETS = {
+    "/": {
+        'script': {'transfer_kb': 600, 'requests': 30},
+        'stylesheet': {'transfer_kb': 100, 'requests': 5},
+        'image': {'transfer_kb': 1500, 'requests': 40},
+        'font': {'transfer_kb': 200, 'requests': 6},
+        'total': {'transfer_kb': 2500, 'requests': 120},
+    },
+    "/admin": {
+        'script': {'transfer_kb': 800, 'requests': 30},
+        'stylesheet': {'transfer_kb': 100, 'requests': 5},
+        'image': {'transfer_kb': 1500, 'requests': 40},
+        'total': {'transfer_kb': 2500, 'requests': 120},
+    },
+}
+
+class AssetBudgetCheck:
+    """One fresh page per route; /admin is opened with an admin session cookie"""
+
+    def __init__(self, base_url, routes=("/", "/admin"), budgets=None, max_asset_kb=500, settle=3, timeout=60, top=10):
+        self.base_url = base_url.rstrip("/")
+        self.routes = list(routes)
+        self.budgets = budgets or DEFAULT_BUDGETS
+        self.max_asset_kb = max_asset_kb
+        self.settle = settle
+        self.timeout = timeout
+        self.top = top
+        self.tester = NavyDisplayTester(self.base_url)
+        self.resources = {}
+        self.results = TestResults()
+
+    @staticmethod
+    def kind_of(resource):
+        path = urlsplit(resource['url']).path
+        if path.startswith("/api/"):
+            return "api"
+        extension = os.path.splitext(path)[1].lower()
+        for kind, extensions in EXTENSION_KINDS.items():
+            if extension in extensions:
+                return kind
+        return INITIATOR_KINDS.get(resource['initiator'], "other")
+
+    # Collection
+
+    def _open_driver(self, admin):
+        driver = self.tester.create_driver()
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RESOURCE_BUFFER_JS})
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        if admin:
+            self.tester.driver = driver
+            self.tester.fixtures['admin_session'] = self.tester.setup_admin_session()
+            self.tester.setup_admin_browser()
+        return driver
+
+    def load(self, route):
+        """Everything the route fetched once no new resource has appeared for `settle` seconds"""
+        driver = self._open_driver(admin=route.startswith("/admin"))
+        try:
+            driver.get(f"{self.base_url}{route}")
+            deadline = time.time() + self.timeout
+            resources, stable_since = [], time.time()
+            while time.time() < deadline:
+                current = driver.execute_script(COLLECT_RESOURCES_JS)
+                if len(current) != len(resources):
+                    resources, stable_since = current, time.time()
+                elif time.time() - stable_since >= self.settle:
+                    break
+                time.sleep(0.5)
+            return resources
+        finally:
+            driver.quit()
+            session = self.tester.fixtures.pop('admin_session', None)
+            if session:
+                self.tester.teardown_admin_session(session)
+            self.tester.driver = None
+
+    # Analysis
+
+    def by_kind(self, resources):
+        totals = {}
+        for resource in resources:
+            for kind in (self.kind_of(resource), "total"):
+                bucket = totals.setdefault(kind, {'requests': 0, 'transfer_kb': 0.0, 'encoded_kb': 0.0, 'decoded_kb': 0.0})
+                bucket['requests'] += 1
+                bucket['transfer_kb'] += resource['transfer'] / 1024
+                bucket['encoded_kb'] += resource['encoded'] / 1024
+                bucket['decoded_kb'] += resource['decoded'] / 1024
+        return totals
+
+    def uncompressed(self, resources):
+        return [
+            resource for resource in resources
+            if (self.kind_of(resource) in TEXT_KINDS or resource['url'].lower().split("?")[0].endswith(".svg"))
+            and resource['decoded'] > 1024 and resource['encoded'] >= resource['decoded']
+        ]
+
+    def evaluate(self, route, resources):
+        totals = self.by_kind(resources)
+        for kind, limits in self.budgets.get(route, {}).items():
+            measured = totals.get(kind, {'requests': 0, 'transfer_kb': 0.0, 'encoded_kb': 0.0, 'decoded_kb': 0.0})
+            for metric, limit in limits.items():
+                value = measured[metric]
+                unit = "" if metric == "requests" else " KB"
+                self.results.add_result(
+                    f"Asset Budget {route}: {kind} {metric.replace('_kb', '')}", value <= limit,
+                    f"{value:.0f}{unit} of {limit:g}{unit}"
+                )
+
+        oversized = [r for r in resources if r['kind'] != "document" and r['transfer'] / 1024 > self.max_asset_kb]
+        self.results.add_result(
+            f"Asset Budget {route}: single assets under {self.max_asset_kb:g} KB", not oversized,
+            ", ".join(f"{urlsplit(r['url']).path} {r['transfer'] / 1024:.0f} KB" for r in oversized)
+        )
+        # Sizes of cross-origin resources without Timing-Allow-Origin read as 0
+        opaque = sum(1 for r in resources if r['decoded'] == 0 and urlsplit(r['url']).netloc != urlsplit(self.base_url).netloc)
+        self.results.add_benchmark(f"assets {route}", dict(totals, opaque_cross_origin=opaque))
+
+    def run(self):
+        for route in self.routes:
+            print(f"{Colors.YELLOW}Loading {route} with the cache disabled...{Colors.END}")
+            try:
+                resources = self.load(route)
+            except Exception as e:
+                self.results.add_result(f"Asset Budget {route}: page load", False, str(e))
+                continue
+            for resource in resources:
+                resource['kind'] = self.kind_of(resource)
+            self.resources[route] = resources
+            self.evaluate(route, resources)
+
+    def print_report(self):
+        for route, resources in self.resources.items():
+            totals = self.by_kind(resources)
+            budgets = self.budgets.get(route, {})
+            print(f"\n{Colors.BLUE}Assets on {route} ({len(resources)} requests){Colors.END}")
+            print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+            print(f"{'Kind':<12}{'Reqs':>6}{'Transfer KB':>13}{'Encoded KB':>12}{'Decoded KB':>12}{'Ratio':>7}{'Budget KB':>11}")
+            for kind, bucket in sorted(totals.items(), key=lambda item: (item[0] == "total", -item[1]['transfer_kb'])):
+                ratio = bucket['decoded_kb'] / bucket['encoded_kb'] if bucket['encoded_kb'] else 0
+                limit = budgets.get(kind, {}).get('transfer_kb')
+                color = Colors.RED if limit is not None and bucket['transfer_kb'] > limit else Colors.END
+                print(f"{color}{kind:<12}{bucket['requests']:>6}{bucket['transfer_kb']:>13.1f}{bucket['encoded_kb']:>12.1f}"
+                      f"{bucket['decoded_kb']:>12.1f}{ratio:>6.1f}x{'-' if limit is None else format(limit, 'g'):>11}{Colors.END}")
+
+            print(f"\nHeaviest assets on {route}:")
+            for resource in sorted(resources, key=lambda r: r['transfer'], reverse=True)[:self.top]:
+                print(f"  {resource['transfer'] / 1024:>9.1f} KB  {resource['kind']:<11} {urlsplit(resource['url']).path}")
+
+            uncompressed = self.uncompressed(resources)
+            if uncompressed:
+                total = sum(r['decoded'] for r in uncompressed) / 1024
+                print(f"{Colors.YELLOW}{len(uncompressed)} text asset(s) ({total:.0f} KB) served without compression{Colors.END}")
+
+def load_budgets(path):
+    """Budgets from a JSON file shaped like DEFAULT_BUDGETS; routes it leaves out keep their defaults"""
+    with open(path) as f:
+        return dict(DEFAULT_BUDGETS, **json.load(f))
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - Asset Budget Check")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--routes", default="/,/admin", metavar="LIST",
+                        help="Routes to load; /admin routes get an admin session (default: /,/admin)")
+    parser.add_argument("--budgets", metavar="PATH",
+                        help="JSON file of {route: {kind: {transfer_kb, encoded_kb, decoded_kb, requests}}}; "
+                             "kinds are document, script, stylesheet, image, font, api, pdf, other and total")
+    parser.add_argument("--max-asset-kb", type=float, default=500, metavar="KB",
+                        help="Largest transfer size allowed for any single asset (default: 500)")
+    parser.add_argument("--settle", type=float, default=3, metavar="SECONDS",
+                        help="A page is loaded once no new resource appeared for this long (default: 3)")
+    parser.add_argument("--top", type=int, default=10, metavar="N",
+                        help="Heaviest assets to list per route (default: 10)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and per-kind totals to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    routes = [route.strip() for route in args.routes.split(",") if route.strip()]
+    budgets = load_budgets(args.budgets) if args.budgets else None
+
+    print(f"{Colors.CYAN}Navy Display System - Asset Budget Check{Colors.END}")
+    print(f"{Colors.CYAN}{'='*40}{Colors.END}")
+
+    check = AssetBudgetCheck(args.base_url, routes, budgets, args.max_asset_kb, args.settle, top=args.top)
+    check.run()
+    check.print_report()
+    check.results.print_summary()
+    if args.json:
+        check.results.export_json(args.json)
+    sys.exit(0 if check.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
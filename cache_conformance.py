@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - HTTP Caching Conformance Test
+Checks validators, conditional requests, byte ranges and freshness for every
+kind of file the display downloads, then replays display cycles through a
+caching client to show what the headers save
+"""
+
+import re
+import sys
+import base64
+import time
+import argparse
+from urllib.parse import quote
+
+import requests
+
+from mock_server import synthetic_pdf
+from test_selenium import Colors, TestResults
+from upload_benchmark import synthetic_png
+
+class CachingClient:
+    """Minimal private HTTP cache: fresh hits, revalidation with ETag/Last-Modified, no-store honored"""
+
+    def __init__(self, session, timeout=30):
+        self.session = session
+        self.timeout = timeout
+        self.entries = {}
+
+    @staticmethod
+    def directives(response):
+        directives = {}
+        for part in response.headers.get("Cache-Control", "").lower().split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name] = value.strip('"')
+        return directives
+
+    def get(self, url, revalidate=False):
+        """Fetch like a browser would; returns (outcome, body bytes over the wire, seconds)
+
+        `revalidate` is fetch()'s cache: 'no-cache', which PDFViewer uses for PDFs
+        """
+        entry = self.entries.get(url)
+        started = time.perf_counter()
+        if entry and not revalidate and not entry['no_cache'] and time.time() - entry['stored'] < entry['max_age']:
+            return "hit", 0, time.perf_counter() - started
+
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        size = len(response.content)
+        elapsed = time.perf_counter() - started
+        if response.status_code == 304 and entry:
+            entry['stored'] = time.time()
+            return "revalidated", size, elapsed
+        response.raise_for_status()
+
+        directives = self.directives(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if "no-store" in directives or not (directives.get("max-age") or etag or last_modified):
+            self.entries.pop(url, None)
+            return "uncacheable", size, elapsed
+        try:
+            max_age = int(directives.get("max-age") or 0)
+        except ValueError:
+            max_age = 0
+        self.entries[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'max_age': max_age,
+            'no_cache': "no-cache" in directives,
+            'stored': time.time(),
+        }
+        return "miss", size, elapsed
+
+class CacheConformanceTest:
+    """Caching checks per asset kind plus a cached vs uncached replay of display cycles"""
+
+    # Fresh for at least a day: PDFs and page images never change under the same URL
+    MIN_MAX_AGE = 86400
+
+    def __init__(self, base_url, cycles=5, seed=True, pdf_pages=10, pdf_page_bytes=50000, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.api_url = f"{self.base_url}/api"
+        self.cycles = cycles
+        self.seed = seed
+        self.pdf_pages = pdf_pages
+        self.pdf_page_bytes = pdf_page_bytes
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.results = TestResults()
+        self.assets = []
+        self.created = []
+        self.replay_stats = {}
+
+    # Assets
+
+    def seed_fixtures(self):
+        """Upload one file of each kind so the checks never depend on what the server happens to hold"""
+        tag = f"cache-check-{int(time.time())}"
+        uploads = [
+            ("/upload-pdf", {
+                'files': {'pdf': (f"{tag}.pdf", synthetic_pdf(self.pdf_pages, self.pdf_page_bytes, "CACHE CHECK"),
+                                  "application/pdf")},
+                'data': {'title': tag, 'type': "plasa"},
+            }),
+            ("/upload-plasa-page", {
+                'files': {'file': ("plasa-page-1.png", synthetic_png(1240, 1754, 200000), "image/png")},
+                'data': {'pageNumber': "1", 'documentId': tag},
+            }),
+            ("/save-escala-cache", {
+                'json': {'escalId': tag, 'imageData': "data:image/png;base64,"
+                         + base64.b64encode(synthetic_png(1754, 1240, 300000)).decode()},
+            }),
+        ]
+        for path, kwargs in uploads:
+            try:
+                response = self.session.post(f"{self.api_url}{path}", timeout=self.timeout, **kwargs)
+                url = response.json().get('data', {}).get('url') if response.ok else None
+            except (requests.exceptions.RequestException, ValueError):
+                url = None
+            if url:
+                self.created.append(url[len("/uploads/"):])
+            else:
+                print(f"{Colors.YELLOW}Could not seed a file through /api{path}{Colors.END}")
+
+    @staticmethod
+    def kind_of(url):
+        if "/plasa-pages/" in url:
+            return "page image"
+        if "/escala-cache/" in url:
+            return "escala image"
+        if url.lower().endswith(".pdf"):
+            return "pdf"
+        return "upload"
+
+    def discover(self):
+        """One representative URL per asset kind: uploads, the PDF proxy and hashed client assets"""
+        urls = [f"/uploads/{relative}" for relative in self.created]
+        try:
+            urls += [doc['url'] for doc in self.session.get(f"{self.api_url}/documents", timeout=self.timeout).json()
+                     if isinstance(doc, dict) and str(doc.get('url', "")).startswith("/uploads/")]
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+
+        found = {}
+        for url in urls:
+            found.setdefault(self.kind_of(url), f"{self.base_url}{url}")
+        if "pdf" in found:
+            pdf = found["pdf"]
+            found["proxy-pdf"] = f"{self.api_url}/proxy-pdf?url={quote(pdf, safe='')}"
+
+        try:
+            index = self.session.get(self.base_url, timeout=self.timeout).text
+            for path in re.findall(r'(?:src|href)="(/assets/[^"]+\.(?:js|css))"', index):
+                found.setdefault("static " + path.rsplit(".", 1)[1], f"{self.base_url}{path}")
+        except requests.exceptions.RequestException:
+            pass
+
+        self.assets = list(found.items())
+        return self.assets
+
+    # Conformance
+
+    def check(self, kind, url):
+        """Validators, 304 on both validators, freshness and (for PDFs) byte ranges"""
+        name = f"Cache {kind}"
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            if response.status_code != 200:
+                self.results.add_result(f"{name}: fetch", False, f"HTTP {response.status_code} for {url}")
+                return
+            body = response.content
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            directives = CachingClient.directives(response)
+
+            self.results.add_result(
+                f"{name}: validators", bool(etag or last_modified),
+                f"ETag={etag or '-'} Last-Modified={last_modified or '-'}"
+            )
+            for header, value in (("If-None-Match", etag), ("If-Modified-Since", last_modified)):
+                if value:
+                    conditional = self.session.get(url, headers={header: value}, timeout=self.timeout)
+                    self.results.add_result(
+                        f"{name}: 304 on {header}",
+                        conditional.status_code == 304 and not conditional.content,
+                        f"HTTP {conditional.status_code}, {len(conditional.content)} bytes"
+                    )
+
+            try:
+                max_age = int(directives.get("max-age") or 0)
+            except ValueError:
+                max_age = 0
+            fresh = "no-store" not in directives and "no-cache" not in directives and max_age >= self.MIN_MAX_AGE
+            self.results.add_result(
+                f"{name}: freshness", fresh,
+                f"Cache-Control: {response.headers.get('Cache-Control', '-')}"
+                + ("" if fresh else " - re-downloaded or revalidated on every display cycle")
+            )
+
+            if kind in ("pdf", "proxy-pdf") and len(body) > 2048:
+                ranged = self.session.get(url, headers={'Range': "bytes=1024-2047"}, timeout=self.timeout)
+                content_range = ranged.headers.get("Content-Range", "")
+                passed = (
+                    ranged.status_code == 206 and ranged.content == body[1024:2048]
+                    and content_range == f"bytes 1024-2047/{len(body)}"
+                )
+                self.results.add_result(
+                    f"{name}: byte range", passed,
+                    f"HTTP {ranged.status_code}, {len(ranged.content)} bytes, Content-Range: {content_range or '-'}"
+                )
+        except requests.exceptions.RequestException as e:
+            self.results.add_result(f"{name}: fetch", False, str(e))
+
+    # Replay
+
+    def session_requests(self):
+        """One display cycle: PDFs fetched with cache 'no-cache' as PDFViewer does, everything else plainly"""
+        return [(kind, url, kind == "pdf") for kind, url in self.assets]
+
+    def replay(self):
+        """Run the same cycles uncached and through CachingClient"""
+        uncached = requests.Session()
+        cached = CachingClient(requests.Session(), self.timeout)
+        stats = {}
+        for _ in range(self.cycles):
+            for kind, url, revalidate in self.session_requests():
+                entry = stats.setdefault(kind, {
+                    'requests': 0, 'hits': 0, 'revalidated': 0,
+                    'bytes_uncached': 0, 'bytes_cached': 0, 'seconds_uncached': 0.0, 'seconds_cached': 0.0,
+                })
+                started = time.perf_counter()
+                entry['bytes_uncached'] += len(uncached.get(url, timeout=self.timeout).content)
+                entry['seconds_uncached'] += time.perf_counter() - started
+
+                outcome, size, seconds = cached.get(url, revalidate)
+                entry['requests'] += 1
+                entry['hits'] += outcome == "hit"
+                entry['revalidated'] += outcome == "revalidated"
+                entry['bytes_cached'] += size
+                entry['seconds_cached'] += seconds
+        for entry in stats.values():
+            entry['hit_ratio'] = (entry['hits'] + entry['revalidated']) / entry['requests']
+            entry['seconds_saved'] = entry['seconds_uncached'] - entry['seconds_cached']
+        self.replay_stats = stats
+        return stats
+
+    def cleanup(self):
+        for relative in self.created:
+            try:
+                self.session.delete(f"{self.api_url}/delete-pdf/{relative}", timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                pass
+
+    def run(self):
+        try:
+            if self.seed:
+                self.seed_fixtures()
+            if not self.discover():
+                self.results.add_result("Cache: assets found", False, "No uploads or client assets to check")
+                return self.results
+            print(f"{Colors.BLUE}Checking {len(self.assets)} asset kinds: {', '.join(k for k, _ in self.assets)}{Colors.END}")
+            for kind, url in self.assets:
+                self.check(kind, url)
+            try:
+                self.replay()
+                self.results.add_benchmark("http-cache", self.replay_stats)
+            except requests.exceptions.RequestException as e:
+                self.results.add_result("Cache replay", False, str(e))
+        finally:
+            self.cleanup()
+        return self.results
+
+    def print_report(self):
+        if not self.replay_stats:
+            return
+        print(f"\n{Colors.BLUE}Display Cycle Replay ({self.cycles} cycles, caching client vs none){Colors.END}")
+        print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+        print(f"{'Asset':<16}{'Reqs':>6}{'Hits':>6}{'304s':>6}{'Hit%':>7}{'KB no cache':>13}{'KB cached':>11}{'ms saved':>10}")
+        total = {'uncached': 0, 'cached': 0, 'saved': 0.0}
+        for kind, entry in self.replay_stats.items():
+            color = Colors.RED if entry['hit_ratio'] == 0 else Colors.END
+            print(
+                f"{color}{kind:<16}{entry['requests']:>6}{entry['hits']:>6}{entry['revalidated']:>6}"
+                f"{entry['hit_ratio'] * 100:>6.0f}%{entry['bytes_uncached'] / 1024:>13.0f}"
+                f"{entry['bytes_cached'] / 1024:>11.0f}{entry['seconds_saved'] * 1000:>10.0f}{Colors.END}"
+            )
+            total['uncached'] += entry['bytes_uncached']
+            total['cached'] += entry['bytes_cached']
+            total['saved'] += entry['seconds_saved']
+        saved = 1 - total['cached'] / total['uncached'] if total['uncached'] else 0.0
+        print(f"Transferred {total['cached'] / 1048576:.1f} MB instead of {total['uncached'] / 1048576:.1f} MB "
+              f"({saved * 100:.0f}% less), {total['saved']:.2f}s saved")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - HTTP Caching Conformance Test")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--cycles", type=int, default=5, metavar="N",
+                        help="Display cycles to replay through the caching client (default: 5)")
+    parser.add_argument("--no-seed", action="store_true",
+                        help="Only check files already on the server instead of uploading one of each kind")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and replay numbers to a JSON file (see test_selenium.py --compare)")
+    parser.add_argument("--junit", metavar="PATH",
+                        help="Write results as a JUnit XML report")
+    args = parser.parse_args()
+
+    print(f"{Colors.CYAN}Navy Display System - HTTP Caching Conformance{Colors.END}")
+    print(f"{Colors.CYAN}{'='*47}{Colors.END}")
+
+    test = CacheConformanceTest(args.base_url, args.cycles, seed=not args.no_seed)
+    results = test.run()
+    test.print_report()
+    results.print_summary()
+    if args.json:
+        results.export_json(args.json)
+    if args.junit:
+        results.export_junit(args.junit, "HttpCaching")
+    sys.exit(0 if results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
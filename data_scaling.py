@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Data Scaling Sweep
+Seeds increasing numbers of notices, documents and military personnel through
+the API and measures list endpoint latency, payload size and render time at
+each size
+"""
+
+import sys
+import math
+import time
+import uuid
+import argparse
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from test_selenium import Colors, LatencyStats, TestResults
+
+RANKS = [("cmg", "officer"), ("cf", "officer"), ("cc", "officer"), ("ct", "officer"), ("1t", "officer"),
+         ("2t", "officer"), ("1sg", "master"), ("2sg", "master"), ("3sg", "master")]
+
+class DataScalingSweep:
+    """Grows each record kind to every target size in turn and measures the list endpoints and pages"""
+
+    # kind: (list endpoint, create endpoint, delete endpoint prefix)
+    KINDS = {
+        "notices": ("/notices", "/notices", "/notices/"),
+        "documents": ("/documents", "/documents", "/documents/"),
+        "personnel": ("/military-personnel", "/military-personnel", "/military-personnel/"),
+    }
+
+    def __init__(self, base_url, sizes=(10, 100, 1000, 10000), kinds=None, repeats=10, seed_concurrency=16,
+                 browser=True, budget_ms=500, budget_kb=1024, timeout=60):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.sizes = sorted(sizes)
+        self.kinds = kinds or list(self.KINDS)
+        self.repeats = repeats
+        self.seed_concurrency = seed_concurrency
+        self.browser = browser
+        self.budget_ms = budget_ms
+        self.budget_kb = budget_kb
+        self.timeout = timeout
+        self.run_id = uuid.uuid4().hex[:6]
+        self.created = {kind: [] for kind in self.kinds}
+        self.seed_errors = 0
+        # measurements[size] = {'api': {kind: summary}, 'render': {name: ms or None}}
+        self.measurements = {}
+        self.results = TestResults()
+        self.tester = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=seed_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    # Seeding
+
+    def record(self, kind, index):
+        """A plausible record; documents are inactive so live displays don't rotate through them"""
+        label = f"Escala {self.run_id}-{index}"
+        if kind == "notices":
+            now = datetime.now(timezone.utc)
+            return {
+                'title': f"Aviso {self.run_id}-{index}",
+                'content': f"{label}: aviso de teste de escala de dados. " * 6,
+                'priority': ("high", "medium", "low")[index % 3],
+                'startDate': (now - timedelta(days=1)).isoformat(),
+                'endDate': (now + timedelta(days=1)).isoformat(),
+                'active': True,
+            }
+        if kind == "documents":
+            doc_type = ("plasa", "escala", "cardapio")[index % 3]
+            return {
+                'title': label,
+                'url': f"/uploads/{doc_type}/scaling-{self.run_id}-{index}.pdf",
+                'type': doc_type,
+                'active': False,
+                'tags': ["scaling"],
+            }
+        rank, kind_of = RANKS[index % len(RANKS)]
+        return {
+            'name': f"MILITAR {self.run_id} {index}",
+            'rank': rank,
+            'type': kind_of,
+            'specialty': None,
+            'fullRankName': rank.upper(),
+            'active': True,
+        }
+
+    def _create(self, kind, index):
+        try:
+            response = self.session.post(f"{self.api_url}{self.KINDS[kind][1]}", json=self.record(kind, index),
+                                         timeout=self.timeout)
+            body = response.json()
+            created = body.get('notice') or body.get('data') or body
+            if response.ok and isinstance(created, dict) and created.get('id') is not None:
+                self.created[kind].append(created['id'])
+                return
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        self.seed_errors += 1
+
+    def seed_to(self, size):
+        """Top up every kind until this run has created `size` records of it"""
+        with ThreadPoolExecutor(max_workers=self.seed_concurrency) as executor:
+            for kind in self.kinds:
+                start = len(self.created[kind])
+                if size > start:
+                    list(executor.map(lambda index, kind=kind: self._create(kind, index), range(start, size)))
+
+    def cleanup(self):
+        with ThreadPoolExecutor(max_workers=self.seed_concurrency) as executor:
+            for kind in self.kinds:
+                prefix = self.KINDS[kind][2]
+                list(executor.map(
+                    lambda record_id: self.session.delete(f"{self.api_url}{prefix}{record_id}", timeout=self.timeout),
+                    self.created[kind]
+                ))
+
+    # Measurement
+
+    def measure_api(self, kind):
+        stats = LatencyStats()
+        payload = records = 0
+        start = time.perf_counter()
+        for _ in range(self.repeats):
+            started = time.perf_counter()
+            try:
+                response = self.session.get(f"{self.api_url}{self.KINDS[kind][0]}", timeout=self.timeout)
+                body = response.content
+                stats.add(time.perf_counter() - started, response.status_code < 400)
+                payload = len(body)
+                data = response.json()
+                if isinstance(data, dict):
+                    data = data.get('notices') or data.get('data') or []
+                records = len(data)
+            except (requests.exceptions.RequestException, ValueError):
+                stats.add(None, False)
+        summary = stats.summary(time.perf_counter() - start)
+        summary.update(payload_bytes=payload, records=records)
+        return summary
+
+    def measure_render(self, size):
+        """Page clock times for the notice and duty officer displays and the admin page at this size"""
+        from test_selenium import NavyDisplayTester
+
+        if self.tester is None:
+            self.tester = NavyDisplayTester(self.base_url)
+            if not self.tester.setup_driver():
+                self.browser = False
+                return {}
+            # Admin.tsx only renders its tabs and fetches personnel once logged in
+            self.tester.fixtures['admin_session'] = self.tester.setup_admin_session()
+            self.tester.setup_admin_browser()
+        tester = self.tester
+        test_name = f"Data Scale {size}"
+        render = {}
+
+        def timed(name, wait):
+            try:
+                value = wait()
+                render[name] = value['end'] if isinstance(value, dict) else value
+            except Exception:
+                render[name] = None
+
+        waits = tester.waits_for(test_name, timeout=60)
+        tester.navigate(tester.base_url, test_name)
+        timed("notices fetched", lambda: waits.response("notices fetched", "GET", "/api/notices"))
+        timed("NoticeDisplay", lambda: waits.rendered("NoticeDisplay rendered", "//*[contains(text(), 'Avisos Importantes')]"))
+        timed("DutyOfficersDisplay", lambda: waits.rendered("DutyOfficersDisplay rendered", "//*[contains(text(), 'Oficial:')]"))
+
+        tester.navigate(f"{tester.base_url}/admin", f"{test_name} Admin")
+        waits = tester.waits_for(f"{test_name} Admin", timeout=60)
+        timed("admin tabs", lambda: waits.rendered(
+            "admin tabs rendered", "//*[contains(text(), 'Avisos') or contains(text(), 'Documentos')]"
+        ))
+        timed("admin personnel fetched", lambda: waits.response("personnel fetched", "GET", "/api/military-personnel"))
+        tester.flush_page_metrics()
+        admin_metrics = tester.results.page_metrics[-1]['metrics'] if tester.results.page_metrics else {}
+        render['admin long tasks'] = admin_metrics.get('long_task_total_ms')
+        return render
+
+    def run(self):
+        try:
+            for size in self.sizes:
+                print(f"{Colors.YELLOW}Seeding {size} of each: {', '.join(self.kinds)}...{Colors.END}")
+                started = time.perf_counter()
+                self.seed_to(size)
+                print(f"Seeded in {time.perf_counter() - started:.1f}s")
+                api = {kind: self.measure_api(kind) for kind in self.kinds}
+                render = self.measure_render(size) if self.browser else {}
+                self.measurements[size] = {'api': api, 'render': render}
+        finally:
+            if self.tester is not None:
+                if self.tester.driver:
+                    self.tester.driver.quit()
+                if 'admin_session' in self.tester.fixtures:
+                    self.tester.teardown_admin_session(self.tester.fixtures.pop('admin_session'))
+                self.results.merge(self.tester.results)
+            self.cleanup()
+        self.evaluate()
+
+    def evaluate(self):
+        """Budget checks at each size, so the first size that needs pagination shows up as a failure"""
+        for size, measured in self.measurements.items():
+            for kind, summary in measured['api'].items():
+                endpoint = f"/api{self.KINDS[kind][0]}"
+                kb = summary['payload_bytes'] / 1024
+                passed = summary['errors'] == 0 and summary['p95_ms'] <= self.budget_ms and kb <= self.budget_kb
+                self.results.add_result(
+                    f"Scale {size}: {endpoint}", passed,
+                    f"{summary['records']} records, p95 {summary['p95_ms']:.0f} ms, {kb:.0f} KB"
+                )
+            self.results.add_benchmark(f"scale {size}", dict(measured['api'], render=measured['render']))
+        if self.seed_errors:
+            self.results.add_result("Scale: seeding", False, f"{self.seed_errors} records could not be created")
+
+    @staticmethod
+    def growth_exponent(points):
+        """Slope of log(value) over log(size): ~0 flat, ~1 linear, >1 worse than linear"""
+        points = [(size, value) for size, value in points if size and value and value > 0]
+        if len(points) < 2 or points[0][0] == points[-1][0]:
+            return None
+        (n1, v1), (n2, v2) = points[0], points[-1]
+        return math.log(v2 / v1) / math.log(n2 / n1)
+
+    def print_report(self):
+        print(f"\n{Colors.BLUE}Data Scaling: list endpoints (p50 ms / KB){Colors.END}")
+        print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+        print(f"{'Records':>8}" + "".join(f"{'/api' + self.KINDS[kind][0]:>30}" for kind in self.kinds))
+        for size, measured in self.measurements.items():
+            cells = []
+            for kind in self.kinds:
+                summary = measured['api'][kind]
+                over = summary['p95_ms'] > self.budget_ms or summary['payload_bytes'] / 1024 > self.budget_kb
+                cell = f"{summary['p50_ms']:.0f} ms / {summary['payload_bytes'] / 1024:.0f} KB"
+                cells.append(f"{Colors.RED if over else ''}{cell:>30}{Colors.END if over else ''}")
+            print(f"{size:>8}" + "".join(cells))
+        growth = []
+        for kind in self.kinds:
+            exponent = self.growth_exponent([
+                (m['api'][kind]['records'], m['api'][kind]['p50_ms']) for m in self.measurements.values()
+            ])
+            if exponent is not None:
+                growth.append(f"/api{self.KINDS[kind][0]} ~n^{exponent:.2f}")
+        if growth:
+            print(f"Latency growth: {', '.join(growth)}")
+
+        renders = [m['render'] for m in self.measurements.values() if m['render']]
+        if renders:
+            names = list(renders[0])
+            print(f"\n{Colors.BLUE}Data Scaling: render (ms since navigation){Colors.END}")
+            print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+            print(f"{'Records':>8}" + "".join(f"{name[:22]:>24}" for name in names))
+            for size, measured in self.measurements.items():
+                render = measured['render']
+                print(f"{size:>8}" + "".join(
+                    f"{'-' if render.get(name) is None else format(render[name], '.0f'):>24}" for name in names
+                ))
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Navy Display System - Data Scaling Sweep. Creates (and afterwards deletes) records "
+                    "through the API; seeded notices are active and will show on connected displays."
+    )
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--sizes", default="10,100,1000,10000", metavar="LIST",
+                        help="Records of each kind to grow to, in turn (default: 10,100,1000,10000)")
+    parser.add_argument("--kinds", default=",".join(DataScalingSweep.KINDS), metavar="LIST",
+                        help="Record kinds to grow: notices,documents,personnel")
+    parser.add_argument("--repeats", type=int, default=10, metavar="N",
+                        help="GETs of each list endpoint per size (default: 10)")
+    parser.add_argument("--seed-concurrency", type=int, default=16, metavar="N",
+                        help="Parallel POSTs while seeding (default: 16)")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="Only measure the API, not page render times")
+    parser.add_argument("--budget-ms", type=float, default=500, metavar="MS",
+                        help="Fail a list endpoint whose p95 exceeds this (default: 500)")
+    parser.add_argument("--budget-kb", type=float, default=1024, metavar="KB",
+                        help="Fail a list endpoint whose payload exceeds this (default: 1024)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and measurements to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError:
+        parser.error("--sizes takes comma-separated integers")
+    if not sizes or min(sizes) < 1:
+        parser.error("--sizes must be positive")
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = [kind for kind in kinds if kind not in DataScalingSweep.KINDS]
+    if unknown:
+        parser.error(f"unknown kind(s): {', '.join(unknown)}")
+
+    print(f"{Colors.CYAN}Navy Display System - Data Scaling Sweep{Colors.END}")
+    print(f"{Colors.CYAN}{'='*40}{Colors.END}")
+
+    sweep = DataScalingSweep(
+        args.base_url, sizes, kinds, args.repeats, args.seed_concurrency,
+        browser=not args.no_browser, budget_ms=args.budget_ms, budget_kb=args.budget_kb
+    )
+    sweep.run()
+    sweep.print_report()
+    sweep.results.print_summary()
+    if args.json:
+        sweep.results.export_json(args.json)
+    sys.exit(0 if sweep.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Distributed Load
+A coordinator splits a scenario (display browsers, stream clients, API request
+rate) across worker processes on this machine or other hosts on the LAN, starts
+them at the same instant and merges their latency histograms
+"""
+
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from sse_load_test import SseSubscriber, raise_fd_limit
+from test_selenium import Colors, EventWaits, HttpBenchmark, NavyDisplayTester, TestResults
+
+class Histogram:
+    """Log-bucketed latency histogram: small on the wire and mergeable across workers
+
+    Bucket i holds values up to 0.01 ms * (1 + PRECISION)^i, so percentiles are
+    within PRECISION of the true value"""
+
+    PRECISION = 0.02
+    FLOOR_MS = 0.01
+
+    def __init__(self):
+        self.buckets = {}
+        self.errors = 0
+        # Requests made, including failures that have no latency bucket
+        self.requests = 0
+        self.max_ms = 0.0
+
+    @classmethod
+    def from_stats(cls, stats):
+        """From a LatencyStats (seconds) collected on a worker"""
+        histogram = cls()
+        for seconds in stats.samples:
+            histogram.add(seconds * 1000)
+        histogram.errors = stats.errors
+        histogram.requests = stats.count
+        return histogram
+
+    def add(self, ms):
+        index = max(0, math.ceil(math.log(max(ms, self.FLOOR_MS) / self.FLOOR_MS) / math.log(1 + self.PRECISION)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.errors += other.errors
+        self.requests += other.requests
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    @property
+    def count(self):
+        return sum(self.buckets.values())
+
+    def percentile(self, pct):
+        """Upper edge of the bucket holding the nearest-rank percentile, in ms"""
+        total = self.count
+        if not total:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * total))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.FLOOR_MS * (1 + self.PRECISION) ** index, self.max_ms)
+        return self.max_ms
+
+    def summary(self, elapsed):
+        count = self.requests
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'error_rate': self.errors / count if count else 0.0,
+            'throughput': count / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ms,
+        }
+
+    def to_dict(self):
+        return {'buckets': {str(index): count for index, count in self.buckets.items()},
+                'errors': self.errors, 'requests': self.requests, 'max_ms': self.max_ms}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.buckets = {int(index): count for index, count in data['buckets'].items()}
+        histogram.errors = data['errors']
+        histogram.requests = data['requests']
+        histogram.max_ms = data['max_ms']
+        return histogram
+
+class WorkerRun:
+    """One worker's share of a scenario, started at an agreed wall-clock time"""
+
+    DISPLAY_XPATH = "//*[contains(text(), 'Marinha do Brasil')]"
+
+    def __init__(self, share):
+        self.share = share
+        self.base_url = share['base_url'].rstrip("/")
+        self.start_at = share['start_at']
+        self.duration = share['duration']
+        self.deadline = None
+        self.histograms = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, ms=None, ok=True):
+        with self._lock:
+            histogram = self.histograms.setdefault(name, Histogram())
+            histogram.requests += 1
+            if ms is not None:
+                histogram.add(ms)
+            if not ok:
+                histogram.errors += 1
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    # Load generators
+
+    def api_load(self):
+        benchmark = HttpBenchmark(f"{self.base_url}/api", self.share['endpoints'], self.share['concurrency'],
+                                  self.duration, self.share['api_rate'])
+        benchmark.run()
+        for endpoint, stats in benchmark.stats.items():
+            histogram = Histogram.from_stats(stats)
+            with self._lock:
+                self.histograms[f"api {endpoint}"] = histogram
+
+    async def _streams(self):
+        gate = asyncio.Semaphore(100)
+        subscribers = [SseSubscriber(self.base_url, self.share['stream']) for _ in range(self.share['streams'])]
+        tasks = []
+
+        async def start(subscriber):
+            async with gate:
+                tasks.append(asyncio.create_task(subscriber.run()))
+                while subscriber.snapshot_seconds is None and subscriber.error is None and time.time() < self.deadline:
+                    await asyncio.sleep(0.01)
+            self.record("stream snapshot", subscriber.snapshot_seconds * 1000 if subscriber.snapshot_seconds else None,
+                        subscriber.snapshot_seconds is not None)
+
+        await asyncio.gather(*(start(subscriber) for subscriber in subscribers))
+        await asyncio.sleep(max(0, self.deadline - time.time()))
+        # A subscription that ended on its own before the deadline is a dropped display
+        self.count("streams dropped", sum(1 for task in tasks if task.done()))
+        for subscriber in subscribers:
+            subscriber.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stream_load(self):
+        raise_fd_limit()
+        asyncio.run(self._streams())
+
+    def display_browser(self):
+        """Open the display, time its first render and keep it up until the deadline"""
+        tester = NavyDisplayTester(self.base_url)
+        try:
+            driver = tester.create_driver()
+        except Exception:
+            self.record("display first render", ok=False)
+            return
+        try:
+            driver.get(self.base_url)
+            waits = EventWaits(driver, TestResults(), "display")
+            rendered_ms = waits.rendered("display rendered", self.DISPLAY_XPATH, timeout=max(1, self.deadline - time.time()))
+            self.record("display first render", rendered_ms)
+            time.sleep(max(0, self.deadline - time.time()))
+        except Exception:
+            self.record("display first render", ok=False)
+        finally:
+            driver.quit()
+
+    def run(self):
+        delay = self.start_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        started = time.time()
+        lateness = started - self.start_at
+        self.deadline = started + self.duration
+
+        jobs = [self.display_browser] * self.share['browsers']
+        if self.share['streams']:
+            jobs.append(self.stream_load)
+        if self.share['api_rate']:
+            jobs.append(self.api_load)
+        with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as executor:
+            for future in [executor.submit(job) for job in jobs]:
+                future.result()
+
+        return {
+            'start_lateness_s': lateness,
+            'elapsed_s': time.time() - started,
+            'histograms': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            'counts': self.counts,
+        }
+
+class WorkerRequestHandler(BaseHTTPRequestHandler):
+    """GET /clock for offset estimation, POST /run to take a share; one run at a time"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/clock":
+            return self._json({'time': time.time()})
+        self._json({'error': "not found"}, 404)
+
+    def do_POST(self):
+        if self.path != "/run":
+            return self._json({'error': "not found"}, 404)
+        share = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        if not self.server.busy.acquire(blocking=False):
+            return self._json({'error': "worker is already running a share"}, 409)
+        try:
+            print(f"{Colors.YELLOW}Running share: {share['browsers']} browser(s), {share['streams']} stream "
+                  f"client(s), {share['api_rate']:g} req/s for {share['duration']:g}s{Colors.END}")
+            self._json(WorkerRun(share).run())
+        except Exception as e:
+            self._json({'error': str(e)}, 500)
+        finally:
+            self.server.busy.release()
+
+def serve_worker(host, port):
+    server = ThreadingHTTPServer((host, port), WorkerRequestHandler)
+    server.daemon_threads = True
+    server.busy = threading.Lock()
+    print(f"{Colors.GREEN}Load worker listening on {host}:{port}{Colors.END}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+class Coordinator:
+    """Splits the scenario, synchronizes the start and merges what the workers measured"""
+
+    def __init__(self, base_url, workers, browsers=0, streams=0, api_rate=0.0, duration=30, stream="documents",
+                 endpoints=None, concurrency=20, lead=5.0, max_skew=0.5):
+        self.base_url = base_url
+        self.workers = workers
+        self.scenario = {'browsers': browsers, 'streams': streams, 'api_rate': api_rate}
+        self.duration = duration
+        self.stream = stream
+        self.endpoints = endpoints or HttpBenchmark.DEFAULT_ENDPOINTS
+        self.concurrency = concurrency
+        self.lead = lead
+        self.max_skew = max_skew
+        self.offsets = {}
+        self.reports = {}
+        self.merged = {}
+        self.summaries = {}
+        self.results = TestResults()
+
+    def split(self, total, index):
+        """Even shares; the first workers take the remainder"""
+        if isinstance(total, float):
+            return total / len(self.workers)
+        return total // len(self.workers) + (1 if index < total % len(self.workers) else 0)
+
+    def clock_offset(self, worker):
+        """Worker clock minus ours, from the /clock round trip with the smallest delay"""
+        best = None
+        for _ in range(5):
+            sent = time.time()
+            worker_time = requests.get(f"http://{worker}/clock", timeout=10).json()['time']
+            received = time.time()
+            if best is None or received - sent < best[0]:
+                best = (received - sent, worker_time - (sent + received) / 2)
+        return best[1]
+
+    def run_worker(self, worker, share):
+        response = requests.post(f"http://{worker}/run", json=share, timeout=self.lead + self.duration + 120)
+        report = response.json()
+        if response.status_code != 200:
+            raise RuntimeError(report.get('error', f"status {response.status_code}"))
+        return report
+
+    def run(self):
+        for worker in self.workers:
+            self.offsets[worker] = self.clock_offset(worker)
+        start_at = time.time() + self.lead
+        print(f"{Colors.YELLOW}Starting {len(self.workers)} worker(s) in {self.lead:g}s{Colors.END}")
+
+        with ThreadPoolExecutor(max_workers=len(self.workers)) as executor:
+            futures = {}
+            for index, worker in enumerate(self.workers):
+                share = {
+                    'base_url': self.base_url,
+                    # The agreed instant on the worker's own clock
+                    'start_at': start_at + self.offsets[worker],
+                    'duration': self.duration,
+                    'browsers': self.split(self.scenario['browsers'], index),
+                    'streams': self.split(self.scenario['streams'], index),
+                    'api_rate': self.split(float(self.scenario['api_rate']), index),
+                    'stream': self.stream,
+                    'endpoints': self.endpoints,
+                    'concurrency': self.concurrency,
+                }
+                futures[worker] = executor.submit(self.run_worker, worker, share)
+            for worker, future in futures.items():
+                try:
+                    self.reports[worker] = future.result()
+                except Exception as e:
+                    self.results.add_result(f"Worker {worker}", False, str(e))
+        self.evaluate()
+
+    def evaluate(self):
+        for worker, report in self.reports.items():
+            lateness = report['start_lateness_s']
+            self.results.add_result(
+                f"Worker {worker}", abs(lateness) <= self.max_skew,
+                f"started {lateness * 1000:+.0f} ms from the agreed time, clock offset {self.offsets[worker] * 1000:+.0f} ms"
+            )
+            for name, data in report['histograms'].items():
+                self.merged.setdefault(name, Histogram()).merge(Histogram.from_dict(data))
+
+        elapsed = self.duration
+        summaries = {name: histogram.summary(elapsed) for name, histogram in sorted(self.merged.items())}
+        api = [histogram for name, histogram in self.merged.items() if name.startswith("api ")]
+        if api:
+            overall = Histogram()
+            for histogram in api:
+                overall.merge(histogram)
+            summaries['api overall'] = overall.summary(elapsed)
+        for name, summary in summaries.items():
+            if not name.startswith("api /"):
+                self.results.add_result(
+                    f"Distributed: {name}", summary['errors'] == 0,
+                    f"{summary['requests']} samples, {summary['errors']} failed, p95 {summary['p95_ms']:.0f} ms"
+                )
+        dropped = sum(report['counts'].get('streams dropped', 0) for report in self.reports.values())
+        if self.scenario['streams']:
+            self.results.add_result("Distributed: streams held", dropped == 0,
+                                    f"{dropped} of {self.scenario['streams']} dropped before the end")
+        self.results.add_benchmark("distributed", summaries)
+        self.summaries = summaries
+
+    def print_report(self):
+        if not self.reports:
+            return
+        print(f"\n{Colors.BLUE}Distributed Load ({len(self.reports)} workers, {self.duration:g}s){Colors.END}")
+        print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+        lateness = [report['start_lateness_s'] * 1000 for report in self.reports.values()]
+        print(f"Start spread across workers: {max(lateness) - min(lateness):.0f} ms")
+        print(f"{'Metric':<28}{'Count':>8}{'Err':>6}{'Rate/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'Max ms':>9}")
+        for name, summary in self.summaries.items():
+            color = Colors.RED if summary['errors'] else Colors.END
+            print(f"{color}{name:<28}{summary['requests']:>8}{summary['errors']:>6}{summary['throughput']:>9.1f}"
+                  f"{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}"
+                  f"{summary['max_ms']:>9.1f}{Colors.END}")
+
+def start_local_workers(count, base_port):
+    """Worker subprocesses on this machine, for trying a scenario without other hosts"""
+    processes, addresses = [], []
+    for port in range(base_port, base_port + count):
+        processes.append(subprocess.Popen(
+            [sys.executable, __file__, "worker", "--host", "127.0.0.1", "--port", str(port)],
+            stdout=subprocess.DEVNULL,
+        ))
+        addresses.append(f"127.0.0.1:{port}")
+    deadline = time.time() + 15
+    for address in addresses:
+        while True:
+            try:
+                requests.get(f"http://{address}/clock", timeout=1)
+                break
+            except requests.exceptions.RequestException:
+                if time.time() > deadline:
+                    # Don't leave the ones that did start holding their ports
+                    for process in processes:
+                        process.terminate()
+                    for process in processes:
+                        process.wait()
+                    raise RuntimeError(f"local worker {address} did not start")
+                time.sleep(0.2)
+    return processes, addresses
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - Distributed Load")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Wait for a coordinator and run the share it sends")
+    worker.add_argument("--host", default="0.0.0.0", help="Interface to listen on (default: 0.0.0.0)")
+    worker.add_argument("--port", type=int, default=7100, help="Port to listen on (default: 7100)")
+
+    run = commands.add_parser("run", help="Split a scenario across workers and merge their results")
+    run.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                     help="Display server URL as the workers reach it (default: http://localhost:5000)")
+    run.add_argument("--workers", metavar="LIST",
+                     help="Comma-separated host:port of running workers")
+    run.add_argument("--local", type=int, metavar="N",
+                     help="Start N workers on this machine instead of using --workers")
+    run.add_argument("--local-port", type=int, default=7100, metavar="PORT",
+                     help="First port for --local workers (default: 7100)")
+    run.add_argument("--browsers", type=int, default=0, metavar="N",
+                     help="Display browsers to open in total (default: 0)")
+    run.add_argument("--streams", type=int, default=0, metavar="M",
+                     help="SSE stream clients to hold in total (default: 0)")
+    run.add_argument("--stream", choices=["documents", "duty-officers"], default="documents",
+                     help="Stream the clients subscribe to (default: documents)")
+    run.add_argument("--rate", type=float, default=0, metavar="RPS",
+                     help="API requests per second in total, open loop (default: 0)")
+    run.add_argument("--endpoints", metavar="PATHS",
+                     help="Comma-separated API paths for the request load, e.g. /notices,/documents")
+    run.add_argument("--concurrency", type=int, default=20, metavar="N",
+                     help="Connections per worker for the request load (default: 20)")
+    run.add_argument("--duration", type=float, default=30, metavar="SECONDS",
+                     help="How long every worker holds its load (default: 30)")
+    run.add_argument("--lead", type=float, default=5, metavar="SECONDS",
+                     help="Time between sending shares and the synchronized start (default: 5)")
+    run.add_argument("--max-skew", type=float, default=0.5, metavar="SECONDS",
+                     help="Fail a worker that started further than this from the agreed time (default: 0.5)")
+    run.add_argument("--json", metavar="PATH",
+                     help="Write results and merged histogram summaries to a JSON file")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        serve_worker(args.host, args.port)
+        return
+
+    if bool(args.workers) == bool(args.local):
+        parser.error("run needs either --workers or --local")
+    if not (args.browsers or args.streams or args.rate):
+        parser.error("run needs --browsers, --streams and/or --rate")
+
+    print(f"{Colors.CYAN}Navy Display System - Distributed Load{Colors.END}")
+    print(f"{Colors.CYAN}{'='*38}{Colors.END}")
+
+    processes = []
+    if args.local:
+        processes, workers = start_local_workers(args.local, args.local_port)
+    else:
+        workers = [address.strip() for address in args.workers.split(",") if address.strip()]
+    endpoints = [path.strip() for path in args.endpoints.split(",")] if args.endpoints else None
+
+    coordinator = Coordinator(
+        args.base_url, workers, args.browsers, args.streams, args.rate, args.duration, args.stream, endpoints,
+        args.concurrency, args.lead, args.max_skew
+    )
+    try:
+        coordinator.run()
+    except Exception as e:
+        coordinator.results.add_result("Distributed: setup", False, str(e))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+    coordinator.print_report()
+    coordinator.results.print_summary()
+    if args.json:
+        coordinator.results.export_json(args.json)
+    sys.exit(0 if coordinator.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,805 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Local Mock API Server
+Stand-in for the Express + PostgreSQL backend so the UI suite can run alone,
+with configurable injected latency and payload sizes
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import queue
+import base64
+import random
+import zlib
+import argparse
+import threading
+import mimetypes
+from email.parser import BytesParser
+from email.policy import HTTP
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+HEARTBEAT_SECONDS = 30
+
+RANKS = ["cmg", "cf", "cc", "ct", "1t", "2t", "1sg", "2sg", "3sg"]
+
+def to_json(payload):
+    """Compact like JSON.stringify, so clients sniffing the raw text see what Express sends"""
+    return json.dumps(payload, separators=(",", ":"))
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+def synthetic_pdf(pages=1, page_bytes=0, title="MOCK"):
+    """A valid PDF with one line of text per page, padded to roughly page_bytes per page"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for number in range(1, pages + 1):
+        text = f"{title} - PAGINA {number} DE {pages}".encode()
+        content = b"BT /F1 36 Tf 72 720 Td (" + text + b") Tj ET\n"
+        # Comments keep the content stream valid while making it realistically heavy
+        filler = max(0, page_bytes - len(content))
+        content += b"".join(b"% " + b"x" * 76 + b"\n" for _ in range(filler // 80))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"endstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % kid for kid in kids) + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for index, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % index + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+class MockState:
+    """In-memory copy of the data the real server keeps in PostgreSQL"""
+
+    def __init__(self, notices=5, documents=3, personnel=10, content_bytes=200, pdf_pages=3, pdf_page_bytes=0):
+        self.lock = threading.Lock()
+        self.pdf_pages = pdf_pages
+        self.pdf_page_bytes = pdf_page_bytes
+        self.next_id = 1
+        self.notices = []
+        self.documents = []
+        self.personnel = []
+        self.view_states = {}
+        self.cache_files = {}
+        self.duty_officers = {
+            'id': 1,
+            'officerName': "MOCK OFICIAL",
+            'masterName': "MOCK CONTRAMESTRE",
+            'officerRank': "1T",
+            'masterRank': "1SG",
+            'validFrom': now_iso(),
+            'updatedAt': now_iso(),
+        }
+        self.subscribers = {"documents": set(), "duty-officers": set()}
+
+        filler = ("Texto de aviso gerado para teste de carga. " * (content_bytes // 40 + 1))[:content_bytes]
+        start = datetime.now(timezone.utc) - timedelta(days=1)
+        for index in range(notices):
+            self.notices.append(self._stamp({
+                'title': f"Aviso de teste {index + 1}",
+                'content': filler,
+                'priority': ("high", "medium", "low")[index % 3],
+                'startDate': start.isoformat(),
+                'endDate': (start + timedelta(days=30)).isoformat(),
+                'active': True,
+            }))
+        for index in range(documents):
+            doc_type = ("plasa", "escala", "cardapio")[index % 3]
+            self.documents.append(self._document({
+                'title': f"{doc_type.upper()} de teste {index + 1}",
+                'url': f"/uploads/mock/{doc_type}-{index + 1}.pdf",
+                'type': doc_type,
+                'category': ("oficial", "praca")[index % 2] if doc_type == "escala" else None,
+                'unit': ("EAGM", "1DN")[index % 2] if doc_type == "cardapio" else None,
+                'active': True,
+                'tags': [],
+            }))
+        for index in range(personnel):
+            rank = RANKS[index % len(RANKS)]
+            self.personnel.append(self._stamp({
+                'name': f"MILITAR {index + 1}",
+                'rank': rank,
+                'type': "officer" if index % len(RANKS) < 6 else "master",
+                'specialty': None,
+                'fullRankName': rank.upper(),
+                'active': True,
+            }))
+
+    def _stamp(self, record):
+        record['id'] = self.next_id
+        self.next_id += 1
+        record.setdefault('createdAt', now_iso())
+        record['updatedAt'] = now_iso()
+        return record
+
+    def _document(self, record):
+        record['id'] = self.next_id
+        self.next_id += 1
+        record.setdefault('uploadDate', now_iso())
+        return record
+
+    def broadcast(self, stream, event):
+        payload = f"data: {to_json(event)}\n\n".encode()
+        for subscriber in list(self.subscribers[stream]):
+            subscriber.put(payload)
+
+    def documents_event(self, event_type):
+        return {
+            'type': event_type,
+            'documents': self.documents,
+            'timestamp': now_iso(),
+            'viewStates': self.view_states,
+        }
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, Nagle and
+    # delayed ACKs add ~40ms to every response and swamp injected latency
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # Helpers
+
+    def _cors(self):
+        # Admin requests use credentials: 'include', which rules out a wildcard
+        origin = self.headers.get("Origin")
+        self.send_header("Access-Control-Allow-Origin", origin or "*")
+        if origin:
+            self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Accept, Authorization, Cache-Control, Range")
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self._cors()
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _json(self, payload, status=200):
+        self._send(status, to_json(payload).encode())
+
+    def _body(self):
+        """The request body, read once; _dispatch drains it if the handler didn't"""
+        if self._request_body is None:
+            length = int(self.headers.get("Content-Length") or 0)
+            self._request_body = self.rfile.read(length) if length else b""
+        return self._request_body
+
+    def _json_body(self):
+        try:
+            return json.loads(self._body() or b"{}")
+        except ValueError:
+            return {}
+
+    def _form(self):
+        """Fields and files of a multipart upload"""
+        content_type = self.headers.get("Content-Type", "")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + self._body()
+        )
+        fields, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename() is not None:
+                files[name] = (part.get_content_type(), part.get_payload(decode=True), part.get_filename())
+            else:
+                fields[name] = part.get_payload(decode=True).decode()
+        return fields, files
+
+    def _inject_latency(self, path):
+        delay = self.server.latency_for(path)
+        if delay > 0:
+            time.sleep(delay)
+
+    # Dispatch
+
+    def do_OPTIONS(self):
+        self._send(204, b"")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        self._request_body = None
+        try:
+            self._route(method)
+        finally:
+            # An unread body would be parsed as the next request on this keep-alive connection
+            if not self.close_connection:
+                self._body()
+
+    def _route(self, method):
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        self.query = parse_qs(parts.query)
+        self._inject_latency(path)
+        for route_method, pattern, handler in ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match:
+                try:
+                    handler(self, *match.groups())
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                return
+        if path.startswith("/uploads/") and method == "GET":
+            return self.serve_upload(path[len("/uploads/"):])
+        if path.startswith("/api/"):
+            return self._json({'error': "Not found"}, 404)
+        self.serve_static(path)
+
+    # Files
+
+    def serve_upload(self, name, cache_control="public, max-age=31536000"):
+        """Files as express.static sends them: validators, conditional GET and single byte ranges"""
+        state = self.server.state
+        if name in state.cache_files:
+            content_type, data = state.cache_files[name]
+        elif name.startswith("mock/") and name.endswith(".pdf"):
+            data = self.server.pdf_for(name)
+            content_type = "application/pdf"
+        else:
+            root = os.path.realpath(self.server.uploads_dir)
+            file_path = os.path.realpath(os.path.join(root, name))
+            if not file_path.startswith(root + os.sep) or not os.path.isfile(file_path):
+                return self._json({'error': "File not found"}, 404)
+            with open(file_path, "rb") as f:
+                data = f.read()
+            content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+
+        etag = f'W/"{len(data):x}-{zlib.crc32(data):x}"'
+        headers = {
+            'Cache-Control': cache_control,
+            'ETag': etag,
+            'Last-Modified': formatdate(self.server.started, usegmt=True),
+            'Accept-Ranges': "bytes",
+        }
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_none_match is not None:
+            not_modified = etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        elif if_modified_since is not None:
+            try:
+                not_modified = parsedate_to_datetime(if_modified_since).timestamp() >= int(self.server.started)
+            except (TypeError, ValueError):
+                not_modified = False
+        else:
+            not_modified = False
+        if not_modified:
+            return self._send(304, b"", content_type, headers)
+
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", "").strip())
+        if match and any(match.groups()):
+            first, last = match.groups()
+            if first:
+                start, end = int(first), min(int(last) if last else len(data) - 1, len(data) - 1)
+            else:
+                start, end = max(len(data) - int(last), 0), len(data) - 1
+            if start > end:
+                return self._send(416, b"", content_type, dict(headers, **{'Content-Range': f"bytes */{len(data)}"}))
+            headers['Content-Range'] = f"bytes {start}-{end}/{len(data)}"
+            return self._send(206, data[start:end + 1], content_type, headers)
+        self._send(200, data, content_type, headers)
+
+    def serve_static(self, path):
+        """Built client from dist/public, falling back to index.html for client routes"""
+        root = self.server.static_dir
+        if not root:
+            return self._json({'error': "No client build to serve"}, 404)
+        root = os.path.realpath(root)
+        file_path = os.path.realpath(os.path.join(root, path.lstrip("/")))
+        if not file_path.startswith(root + os.sep) or not os.path.isfile(file_path):
+            file_path = os.path.join(root, "index.html")
+            if not os.path.isfile(file_path):
+                return self._json({'error': "Not found"}, 404)
+        with open(file_path, "rb") as f:
+            data = f.read()
+        self._send(200, data, mimetypes.guess_type(file_path)[0] or "application/octet-stream")
+
+    # SSE
+
+    def stream(self, name):
+        state = self.server.state
+        inbox = queue.Queue()
+        self.send_response(200)
+        self._cors()
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        with state.lock:
+            state.subscribers[name].add(inbox)
+            if name == "documents":
+                snapshot = state.documents_event("snapshot")
+            else:
+                snapshot = {'type': "snapshot", 'officers': state.duty_officers, 'timestamp': now_iso()}
+        inbox.put(f"data: {to_json(snapshot)}\n\n".encode())
+
+        try:
+            while not self.server.stopping.is_set():
+                try:
+                    payload = inbox.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    payload = b": heartbeat\n\n"
+                if payload is None:
+                    break
+                self.wfile.write(b"%x\r\n" % len(payload) + payload + b"\r\n")
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            with state.lock:
+                state.subscribers[name].discard(inbox)
+            self.close_connection = True
+
+    # API handlers
+
+    def health(self):
+        self._json({'status': "ok", 'timestamp': now_iso(), 'message': "Mock server"})
+
+    def status(self):
+        self._json({'status': "online", 'timestamp': now_iso(), 'version': "mock"})
+
+    def get_notices(self):
+        notices = self.server.state.notices
+        self._json({'success': True, 'notices': notices, 'count': len(notices), 'timestamp': now_iso()})
+
+    def create_notice(self):
+        body = self._json_body()
+        if not body.get("title") or not body.get("content"):
+            return self._json({'success': False, 'error': "VALIDATION_ERROR: Title and content are required"}, 400)
+        state = self.server.state
+        with state.lock:
+            notice = state._stamp({
+                'title': body["title"],
+                'content': body["content"],
+                'priority': body.get("priority", "medium"),
+                'startDate': body.get("startDate"),
+                'endDate': body.get("endDate"),
+                'active': body.get("active", True) is not False,
+            })
+            state.notices.append(notice)
+        self._json({'success': True, 'notice': notice, 'message': "Notice created successfully"})
+
+    def update_notice(self, notice_id):
+        state = self.server.state
+        with state.lock:
+            notice = next((n for n in state.notices if n['id'] == int(notice_id)), None)
+            if notice:
+                notice.update(self._json_body())
+                notice['id'] = int(notice_id)
+                notice['updatedAt'] = now_iso()
+        if not notice:
+            return self._json({'success': False, 'error': "NOT_FOUND: Notice not found"}, 404)
+        self._json({'success': True, 'notice': notice, 'message': "Notice updated successfully"})
+
+    def delete_notice(self, notice_id):
+        state = self.server.state
+        with state.lock:
+            before = len(state.notices)
+            state.notices = [n for n in state.notices if n['id'] != int(notice_id)]
+            deleted = len(state.notices) < before
+        if not deleted:
+            return self._json({'success': False, 'error': "NOT_FOUND: Notice not found"}, 404)
+        self._json({'success': True, 'message': "Notice deleted successfully", 'deletedId': int(notice_id)})
+
+    def get_documents(self):
+        self._json(self.server.state.documents)
+
+    def create_document(self):
+        body = self._json_body()
+        if not body.get("title") or not body.get("url") or body.get("type") not in ("plasa", "escala", "cardapio"):
+            return self._json({'error': "Invalid data"}, 400)
+        state = self.server.state
+        with state.lock:
+            document = state._document({
+                'title': body["title"],
+                'url': body["url"],
+                'type': body["type"],
+                'category': body.get("category"),
+                'unit': body.get("unit"),
+                'active': body.get("active", True) is not False,
+                'tags': body.get("tags") or [],
+            })
+            state.documents.append(document)
+            state.broadcast("documents", state.documents_event("update"))
+        self._json(document)
+
+    def update_document(self, document_id):
+        state = self.server.state
+        with state.lock:
+            document = next((d for d in state.documents if d['id'] == int(document_id)), None)
+            if document:
+                document.update(self._json_body())
+                document['id'] = int(document_id)
+                state.broadcast("documents", state.documents_event("update"))
+        if not document:
+            return self._json({'error': "Document not found"}, 404)
+        self._json(document)
+
+    def delete_document(self, document_id):
+        state = self.server.state
+        with state.lock:
+            before = len(state.documents)
+            state.documents = [d for d in state.documents if d['id'] != int(document_id)]
+            deleted = len(state.documents) < before
+            if deleted:
+                state.broadcast("documents", state.documents_event("update"))
+        if not deleted:
+            return self._json({'error': "Document not found"}, 404)
+        self._json({'success': True})
+
+    def get_view_states(self):
+        self._json({'success': True, 'viewStates': self.server.state.view_states, 'timestamp': now_iso()})
+
+    def set_view_state(self):
+        body = self._json_body()
+        document_id = str(body.get("documentId") or "").strip()
+        if not re.fullmatch(r"[\w-]+", document_id):
+            return self._json({'success': False, 'error': "INVALID_DOCUMENT_ID"}, 400)
+        try:
+            zoom = min(max(float(body.get("zoom")), 0.5), 3)
+        except (TypeError, ValueError):
+            return self._json({'success': False, 'error': "INVALID_ZOOM_VALUE"}, 400)
+        view_state = {
+            'zoom': zoom,
+            'scrollTop': max(float(body.get("scrollTop") or 0), 0),
+            'scrollLeft': max(float(body.get("scrollLeft") or 0), 0),
+            'updatedAt': now_iso(),
+        }
+        state = self.server.state
+        with state.lock:
+            state.view_states[document_id] = view_state
+            state.broadcast("documents", {
+                'type': "view-state",
+                'documents': None,
+                'timestamp': view_state['updatedAt'],
+                'viewStates': {document_id: view_state},
+            })
+        self._json({'success': True, 'state': view_state})
+
+    def get_duty_officers(self):
+        self._json({'success': True, 'officers': self.server.state.duty_officers, 'timestamp': now_iso()})
+
+    def put_duty_officers(self):
+        body = self._json_body()
+        state = self.server.state
+        with state.lock:
+            officers = dict(state.duty_officers)
+            for key in ("officerName", "masterName", "officerRank", "masterRank"):
+                value = body.get(key)
+                officers[key] = value.strip().upper() if isinstance(value, str) else officers.get(key)
+            officers['id'] = officers['id'] + 1
+            officers['validFrom'] = body.get("validFrom") or now_iso()
+            officers['updatedAt'] = now_iso()
+            state.duty_officers = officers
+            state.broadcast("duty-officers", {'type': "update", 'officers': officers, 'timestamp': officers['updatedAt']})
+        self._json({'success': True, 'officers': officers, 'timestamp': officers['updatedAt']})
+
+    def get_personnel(self):
+        personnel = self.server.state.personnel
+        kind = (self.query.get("type") or [None])[0]
+        if kind in ("officer", "master"):
+            personnel = [p for p in personnel if p['type'] == kind]
+        self._json({'success': True, 'data': personnel})
+
+    def create_personnel(self):
+        body = self._json_body()
+        if not body.get("name") or body.get("rank") not in RANKS or body.get("type") not in ("officer", "master"):
+            return self._json({'success': False, 'error': "Validation error"}, 400)
+        state = self.server.state
+        with state.lock:
+            record = state._stamp({
+                'name': body["name"],
+                'rank': body["rank"],
+                'type': body["type"],
+                'specialty': body.get("specialty"),
+                'fullRankName': body.get("fullRankName") or body["rank"].upper(),
+                'active': body.get("active", True) is not False,
+            })
+            state.personnel.append(record)
+        self._json({'success': True, 'data': record})
+
+    def update_personnel(self, personnel_id):
+        state = self.server.state
+        with state.lock:
+            record = next((p for p in state.personnel if p['id'] == int(personnel_id)), None)
+            if record:
+                record.update(self._json_body())
+                record['id'] = int(personnel_id)
+                record['updatedAt'] = now_iso()
+        if not record:
+            return self._json({'success': False, 'error': "Military personnel not found"}, 404)
+        self._json({'success': True, 'data': record})
+
+    def delete_personnel(self, personnel_id):
+        state = self.server.state
+        with state.lock:
+            before = len(state.personnel)
+            state.personnel = [p for p in state.personnel if p['id'] != int(personnel_id)]
+            deleted = len(state.personnel) < before
+        if not deleted:
+            return self._json({'success': False, 'error': "Military personnel not found"}, 404)
+        self._json({'success': True, 'message': "Military personnel deleted successfully"})
+
+    def admin_session(self):
+        self._json({'authenticated': True, 'username': "admin"})
+
+    def admin_login(self):
+        self._json({'success': True, 'message': "Autenticado com sucesso"})
+
+    def admin_logout(self):
+        self._json({'success': True})
+
+    def list_pdfs(self):
+        self._json({'documents': []})
+
+    def cache_status(self):
+        files = self.server.state.cache_files
+        plasa = sum(1 for name in files if name.startswith("plasa-pages/"))
+        escala = sum(1 for name in files if name.startswith("escala-cache/"))
+        self._json({
+            'success': True,
+            'cache': {
+                'plasa': {'count': plasa, 'directory': "/uploads/plasa-pages/"},
+                'escala': {'count': escala, 'directory': "/uploads/escala-cache/"},
+                'total': plasa + escala,
+            },
+            'timestamp': now_iso(),
+        })
+
+    def upload_pdf(self):
+        fields, files = self._form()
+        if "pdf" not in files:
+            return self._json({'success': False, 'error': "MISSING_FILE: No file uploaded"}, 400)
+        if not fields.get("title") or fields.get("type") not in ("plasa", "escala", "cardapio"):
+            return self._json({'success': False, 'error': "MISSING_FIELDS: Title and type are required"}, 400)
+        content_type, data, original = files["pdf"]
+        safe_name = re.sub(r"[^\w.-]", "_", original or "upload.pdf")
+        filename = f"{int(time.time() * 1000)}-{random.randint(0, 10**9)}-{safe_name}"
+        self.server.state.cache_files[f"{fields['type']}/{filename}"] = (content_type, data)
+        self._json({'success': True, 'data': {
+            'filename': filename, 'originalname': original, 'size': len(data),
+            'url': f"/uploads/{fields['type']}/{filename}", 'title': fields["title"], 'type': fields["type"],
+        }})
+
+    def delete_pdf(self, name):
+        if self.server.state.cache_files.pop(name, None) is None:
+            return self._json({'success': False, 'error': "File not found"}, 404)
+        self._json({'success': True, 'message': "File deleted successfully", 'fileDeleted': True, 'metadataRemoved': False})
+
+    def upload_plasa_page(self):
+        fields, files = self._form()
+        if "file" not in files:
+            return self._json({'success': False, 'error': "Nenhum arquivo enviado"}, 400)
+        document_id = re.sub(r"[^a-zA-Z0-9_-]", "", fields.get("documentId", "default"))[:50]
+        page = fields.get("pageNumber", "")
+        if not document_id or not page.isdigit():
+            return self._json({'success': False, 'error': "documentId ou pageNumber inválidos"}, 400)
+        content_type, data, _ = files["file"]
+        filename = f"{document_id}-page-{page}.{'png' if content_type == 'image/png' else 'jpg'}"
+        self.server.state.cache_files[f"plasa-pages/{filename}"] = (content_type, data)
+        self._json({'success': True, 'data': {
+            'url': f"/uploads/plasa-pages/{filename}", 'filename': filename,
+            'pageNumber': int(page), 'documentId': document_id,
+        }})
+
+    def check_plasa_pages(self):
+        body = self._json_body()
+        document_id, total = body.get("documentId"), int(body.get("totalPages") or 0)
+        if not document_id or not total:
+            return self._json({'success': False, 'error': "totalPages e documentId são obrigatórios"}, 400)
+        urls = []
+        for page in range(1, total + 1):
+            name = next((f"plasa-pages/{document_id}-page-{page}.{ext}" for ext in ("png", "jpg")
+                         if f"plasa-pages/{document_id}-page-{page}.{ext}" in self.server.state.cache_files), None)
+            if not name:
+                break
+            urls.append(f"/uploads/{name}")
+        complete = len(urls) == total
+        self._json({'success': True, 'allPagesExist': complete, 'pageUrls': urls if complete else [],
+                    'totalPages': total if complete else 0, 'documentId': document_id})
+
+    def save_escala_cache(self):
+        body = self._json_body()
+        escala_id = re.sub(r"[^a-zA-Z0-9_-]", "", str(body.get("escalId") or ""))[:50]
+        match = re.match(r"^data:image/(png|jpeg|jpg);base64,", str(body.get("imageData") or ""), re.I)
+        if not escala_id or not match:
+            return self._json({'success': False, 'error': "escalId e imageData são obrigatórios"}, 400)
+        ext = "jpg" if match.group(1).lower() in ("jpeg", "jpg") else "png"
+        data = base64.b64decode(body["imageData"][match.end():])
+        self.server.state.cache_files[f"escala-cache/{escala_id}.{ext}"] = (f"image/{'jpeg' if ext == 'jpg' else 'png'}", data)
+        self._json({'success': True, 'data': {
+            'url': f"/uploads/escala-cache/{escala_id}.{ext}", 'filename': f"{escala_id}.{ext}", 'escalId': escala_id,
+        }})
+
+    def check_escala_cache(self, escala_id):
+        name = next((f"escala-cache/{escala_id}.{ext}" for ext in ("png", "jpg")
+                     if f"escala-cache/{escala_id}.{ext}" in self.server.state.cache_files), None)
+        if name:
+            return self._json({'success': True, 'cached': True, 'url': f"/uploads/{name}", 'escalId': escala_id})
+        self._json({'success': True, 'cached': False, 'escalId': escala_id})
+
+    def proxy_pdf(self):
+        url = (self.query.get("url") or [""])[0]
+        if "/uploads/" not in url:
+            return self._json({'error': "File not found"}, 404)
+        # Same headers as the real proxy, which forbids caching outright
+        self.serve_upload(url.split("/uploads/", 1)[1], "no-store, no-cache, must-revalidate, proxy-revalidate")
+
+ROUTES = [(method, re.compile(pattern), handler) for method, pattern, handler in [
+    ("GET", r"/api/health", MockRequestHandler.health),
+    ("GET", r"/api/status", MockRequestHandler.status),
+    ("GET", r"/api/notices", MockRequestHandler.get_notices),
+    ("POST", r"/api/notices", MockRequestHandler.create_notice),
+    ("PUT", r"/api/notices/(\d+)", MockRequestHandler.update_notice),
+    ("DELETE", r"/api/notices/(\d+)", MockRequestHandler.delete_notice),
+    ("GET", r"/api/documents/stream", lambda handler: handler.stream("documents")),
+    ("GET", r"/api/documents/view-state", MockRequestHandler.get_view_states),
+    ("POST", r"/api/documents/view-state", MockRequestHandler.set_view_state),
+    ("GET", r"/api/documents", MockRequestHandler.get_documents),
+    ("POST", r"/api/documents", MockRequestHandler.create_document),
+    ("PUT", r"/api/documents/(\d+)", MockRequestHandler.update_document),
+    ("DELETE", r"/api/documents/(\d+)", MockRequestHandler.delete_document),
+    ("GET", r"/api/duty-officers/stream", lambda handler: handler.stream("duty-officers")),
+    ("GET", r"/api/duty-officers", MockRequestHandler.get_duty_officers),
+    ("PUT", r"/api/duty-officers", MockRequestHandler.put_duty_officers),
+    ("GET", r"/api/military-personnel", MockRequestHandler.get_personnel),
+    ("POST", r"/api/military-personnel", MockRequestHandler.create_personnel),
+    ("PUT", r"/api/military-personnel/(\d+)", MockRequestHandler.update_personnel),
+    ("DELETE", r"/api/military-personnel/(\d+)", MockRequestHandler.delete_personnel),
+    ("GET", r"/api/admin/session", MockRequestHandler.admin_session),
+    ("POST", r"/api/admin/login", MockRequestHandler.admin_login),
+    ("POST", r"/api/admin/logout", MockRequestHandler.admin_logout),
+    ("GET", r"/api/list-pdfs", MockRequestHandler.list_pdfs),
+    ("GET", r"/api/cache-status", MockRequestHandler.cache_status),
+    ("POST", r"/api/upload-pdf", MockRequestHandler.upload_pdf),
+    ("DELETE", r"/api/delete-pdf/(.+)", MockRequestHandler.delete_pdf),
+    ("POST", r"/api/upload-plasa-page", MockRequestHandler.upload_plasa_page),
+    ("POST", r"/api/check-plasa-pages", MockRequestHandler.check_plasa_pages),
+    ("POST", r"/api/save-escala-cache", MockRequestHandler.save_escala_cache),
+    ("GET", r"/api/check-escala-cache/([\w-]+)", MockRequestHandler.check_escala_cache),
+    ("GET", r"/api/proxy-pdf", MockRequestHandler.proxy_pdf),
+]]
+
+class MockApiServer(ThreadingHTTPServer):
+    """Threaded mock backend; start() serves it from a background thread"""
+    daemon_threads = True
+    # socketserver's default backlog of 5 drops SYNs during connection storms
+    request_queue_size = 1024
+
+    def __init__(self, host="0.0.0.0", port=5001, state=None, latency=0.0, jitter=0.0, route_latency=None,
+                 uploads_dir="uploads", static_dir=None, verbose=False):
+        super().__init__((host, port), MockRequestHandler)
+        self.state = state or MockState()
+        self.latency = latency
+        self.jitter = jitter
+        self.route_latency = [(re.compile(pattern), seconds) for pattern, seconds in (route_latency or {}).items()]
+        self.uploads_dir = uploads_dir
+        self.static_dir = static_dir
+        self.verbose = verbose
+        self.started = time.time()
+        self.stopping = threading.Event()
+        self._pdfs = {}
+        self._thread = None
+
+    def latency_for(self, path):
+        """Injected delay in seconds: first matching route override, else base plus jitter"""
+        for pattern, seconds in self.route_latency:
+            if pattern.search(path):
+                return seconds
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def pdf_for(self, name):
+        if name not in self._pdfs:
+            title = os.path.splitext(os.path.basename(name))[0].upper()
+            self._pdfs[name] = synthetic_pdf(self.state.pdf_pages, self.state.pdf_page_bytes, title)
+        return self._pdfs[name]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        # Wake every stream thread so it exits instead of waiting for a heartbeat
+        for subscribers in self.state.subscribers.values():
+            for inbox in list(subscribers):
+                inbox.put(None)
+        self.shutdown()
+        self.server_close()
+
+def parse_route_latency(values):
+    """PATTERN=MS pairs into a {regex: seconds} map"""
+    routes = {}
+    for value in values or []:
+        pattern, _, ms = value.rpartition("=")
+        routes[pattern] = float(ms) / 1000
+    return routes
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - Local Mock API Server")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=5001, help="Port to listen on (default: 5001, as the client expects)")
+    parser.add_argument("--latency", type=float, default=0, metavar="MS", help="Delay added to every request")
+    parser.add_argument("--jitter", type=float, default=0, metavar="MS", help="Extra random delay of up to MS")
+    parser.add_argument("--route-latency", action="append", metavar="PATTERN=MS",
+                        help="Delay for paths matching a regex, e.g. /api/documents=800 (repeatable)")
+    parser.add_argument("--notices", type=int, default=5, metavar="N", help="Seeded notices (default: 5)")
+    parser.add_argument("--documents", type=int, default=3, metavar="N", help="Seeded documents (default: 3)")
+    parser.add_argument("--personnel", type=int, default=10, metavar="N", help="Seeded military personnel (default: 10)")
+    parser.add_argument("--content-bytes", type=int, default=200, metavar="BYTES",
+                        help="Size of each seeded notice's content (default: 200)")
+    parser.add_argument("--pdf-pages", type=int, default=3, metavar="N",
+                        help="Pages in each synthetic document PDF (default: 3)")
+    parser.add_argument("--pdf-page-bytes", type=int, default=0, metavar="BYTES",
+                        help="Padding per synthetic PDF page (default: 0)")
+    parser.add_argument("--uploads", default="uploads", metavar="DIR", help="Directory served under /uploads")
+    parser.add_argument("--static", default=os.path.join("dist", "public"), metavar="DIR",
+                        help="Client build served for non-API paths (default: dist/public)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    state = MockState(args.notices, args.documents, args.personnel, args.content_bytes,
+                      args.pdf_pages, args.pdf_page_bytes)
+    server = MockApiServer(
+        args.host, args.port, state, args.latency / 1000, args.jitter / 1000,
+        parse_route_latency(args.route_latency), args.uploads,
+        args.static if os.path.isdir(args.static) else None, args.verbose
+    )
+    print(f"Mock API server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - PDF Rendering Benchmark
+Uploads synthetic PLASA editions of increasing size, makes each the active PLASA
+and times how long PDFViewer takes to show it and to cache every page
+"""
+
+import re
+import sys
+import time
+import math
+import argparse
+
+import requests
+
+from mock_server import synthetic_pdf
+from test_selenium import Colors, NavyDisplayTester, TestResults
+
+# Installed before the app's scripts run: page clock at which each rendered
+# PLASA page image finished loading into an <img>
+SHOWN_HOOK_JS = """
+(function () {
+    if (window.__navyPlasaShown) return;
+    var shown = window.__navyPlasaShown = {};
+    document.addEventListener('load', function (event) {
+        var img = event.target;
+        if (img.tagName === 'IMG' && /plasa-pages/.test(img.src) && !(img.src in shown)) {
+            shown[img.src] = performance.now();
+        }
+    }, true);
+})();
+"""
+
+# Page clock (ms since navigation) of everything PDFViewer did with one PDF,
+# read from the network log create_driver installs and the rendered page image
+COLLECT_JS = """
+var pdfName = arguments[0];
+var log = window.__navyNetwork || [];
+var download = null, pages = [];
+log.forEach(function (entry) {
+    if (entry.end === null) return;
+    if (!download && entry.method === 'GET' && entry.url.indexOf(pdfName) !== -1) download = entry.end;
+    if (entry.method === 'POST' && entry.url.indexOf('/api/upload-plasa-page') !== -1 && entry.status < 400) {
+        pages.push(entry.end);
+    }
+});
+var shown = Array.prototype.slice.call(document.querySelectorAll('img')).filter(function (img) {
+    return img.complete && img.naturalWidth > 0 && /plasa-pages/.test(img.src);
+})[0];
+return {
+    download: download,
+    pages: pages,
+    shown_src: shown ? shown.src : null,
+    shown_at: shown ? (window.__navyPlasaShown || {})[shown.src] || null : null,
+    now: performance.now()
+};
+"""
+
+class PdfRenderBenchmark:
+    """Opens one synthetic edition per page count and display resolution on a fresh display page"""
+
+    def __init__(self, base_url, page_counts=(1, 10, 50, 100, 200), resolutions=((1920, 1080),),
+                 page_bytes=20000, timeout_per_page=5.0, keep_files=False):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.page_counts = sorted(page_counts)
+        self.resolutions = list(resolutions)
+        self.page_bytes = page_bytes
+        self.timeout_per_page = timeout_per_page
+        self.keep_files = keep_files
+        self.run_id = int(time.time())
+        self.session = requests.Session()
+        self.tester = NavyDisplayTester(base_url)
+        self.driver = None
+        # The benchmark edition has to be the active PLASA, so others are switched off meanwhile
+        self.deactivated = []
+        self.created_files = []
+        # measurements['1920x1080'][pages] = {'download_ms', 'per_page_ms', 'cached_ms', ...}
+        self.measurements = {}
+        self.results = TestResults()
+
+    # Server state
+
+    def deactivate_other_plasas(self):
+        for document in self.session.get(f"{self.api_url}/documents", timeout=30).json():
+            if document.get('type') == "plasa" and document.get('active'):
+                self.session.put(f"{self.api_url}/documents/{document['id']}", json={'active': False}, timeout=30)
+                self.deactivated.append(document['id'])
+
+    def restore_plasas(self):
+        for document_id in self.deactivated:
+            try:
+                self.session.put(f"{self.api_url}/documents/{document_id}", json={'active': True}, timeout=30)
+            except requests.exceptions.RequestException:
+                print(f"{Colors.RED}Could not reactivate PLASA document {document_id}{Colors.END}")
+
+    def publish(self, pages, resolution):
+        """Upload an edition and make it the active PLASA; returns (document id, PDF file name)"""
+        name = f"render-benchmark-{self.run_id}-{pages}p-{resolution[0]}.pdf"
+        response = self.session.post(f"{self.api_url}/upload-pdf", files={
+            'pdf': (name, synthetic_pdf(pages, self.page_bytes, "RENDER BENCHMARK"), "application/pdf"),
+        }, data={'title': name, 'type': "plasa"}, timeout=120)
+        response.raise_for_status()
+        url = response.json()['data']['url']
+        self.created_files.append(url[len("/uploads/"):])
+        document = self.session.post(f"{self.api_url}/documents", json={
+            'title': f"Render benchmark {pages} pages", 'url': url, 'type': "plasa", 'active': True,
+        }, timeout=30)
+        document.raise_for_status()
+        return document.json()['id'], url.rsplit("/", 1)[-1]
+
+    def unpublish(self, document_id, shown_src, pages):
+        self.session.delete(f"{self.api_url}/documents/{document_id}", timeout=30)
+        # Page images are named <documentId>-page-<n>.png after a per-load id PDFViewer makes up
+        match = re.search(r"/plasa-pages/(.+)-page-\d+\.(\w+)", shown_src or "")
+        if match:
+            self.created_files += [f"plasa-pages/{match.group(1)}-page-{n}.{match.group(2)}" for n in range(1, pages + 1)]
+
+    def cleanup(self):
+        if self.keep_files:
+            return
+        for relative in self.created_files:
+            try:
+                self.session.delete(f"{self.api_url}/delete-pdf/{relative}", timeout=30)
+            except requests.exceptions.RequestException:
+                pass
+
+    # Measurement
+
+    def measure(self, pages, resolution):
+        document_id, pdf_name = self.publish(pages, resolution)
+        deadline = time.time() + 30 + pages * self.timeout_per_page
+        observed = {}
+        shown_at = None
+        try:
+            self.driver.set_window_size(*resolution)
+            self.driver.get(self.base_url)
+            # Done once every page is cached and one of them is on screen
+            while time.time() < deadline:
+                observed = self.driver.execute_script(COLLECT_JS, pdf_name)
+                if observed['shown_src'] and shown_at is None:
+                    # The image's load time; the poll clock only if the hook missed it
+                    shown_at = observed['shown_at'] or observed['now']
+                if len(observed['pages']) >= pages and observed['shown_src']:
+                    break
+                time.sleep(0.25)
+        finally:
+            self.unpublish(document_id, observed.get('shown_src'), pages)
+
+        page_times = sorted(observed.get('pages', []))
+        gaps = [later - earlier for earlier, later in zip(page_times, page_times[1:])]
+        cached = page_times[-1] if len(page_times) >= pages else None
+        return {
+            'download_ms': observed.get('download'),
+            'first_page_cached_ms': page_times[0] if page_times else None,
+            'first_page_shown_ms': shown_at,
+            'per_page_ms': sorted(gaps)[len(gaps) // 2] if gaps else None,
+            'cached_ms': cached,
+            'pages_cached': len(page_times),
+        }
+
+    def run(self):
+        self.driver = self.tester.create_driver()
+        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SHOWN_HOOK_JS})
+        try:
+            self.deactivate_other_plasas()
+            for resolution in self.resolutions:
+                label = f"{resolution[0]}x{resolution[1]}"
+                by_pages = self.measurements.setdefault(label, {})
+                for pages in self.page_counts:
+                    print(f"{Colors.YELLOW}Rendering {pages} page(s) at {label}...{Colors.END}")
+                    try:
+                        by_pages[pages] = self.measure(pages, resolution)
+                    except Exception as e:
+                        self.results.add_result(f"PDF Render {pages}p @ {label}", False, str(e))
+        finally:
+            self.driver.quit()
+            self.restore_plasas()
+            self.cleanup()
+        self.evaluate()
+
+    def evaluate(self):
+        for label, by_pages in self.measurements.items():
+            for pages, measured in by_pages.items():
+                passed = measured['cached_ms'] is not None
+                detail = (f"cached in {measured['cached_ms'] / 1000:.1f}s" if passed
+                          else f"{measured['pages_cached']}/{pages} pages cached before timing out")
+                self.results.add_result(f"PDF Render {pages}p @ {label}", passed, detail)
+            self.results.add_benchmark(f"pdf render {label}", {f"{pages} pages": m for pages, m in by_pages.items()})
+
+    @staticmethod
+    def growth_exponent(points):
+        """Slope of log(time) over log(pages) between the smallest and largest edition"""
+        points = [(pages, value) for pages, value in points if value]
+        if len(points) < 2 or points[0][0] == points[-1][0]:
+            return None
+        (n1, v1), (n2, v2) = points[0], points[-1]
+        return math.log(v2 / v1) / math.log(n2 / n1)
+
+    def print_report(self):
+        def fmt(value, scale=1000, digits=2):
+            return "-" if value is None else f"{value / scale:.{digits}f}"
+
+        for label, by_pages in self.measurements.items():
+            print(f"\n{Colors.BLUE}PDF Rendering at {label} (seconds since navigation){Colors.END}")
+            print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+            print(f"{'Pages':>6}{'Download':>10}{'1st cached':>12}{'1st shown':>11}{'Per page':>10}{'All cached':>12}")
+            for pages, m in by_pages.items():
+                print(f"{pages:>6}{fmt(m['download_ms']):>10}{fmt(m['first_page_cached_ms']):>12}"
+                      f"{fmt(m['first_page_shown_ms']):>11}{fmt(m['per_page_ms']):>10}{fmt(m['cached_ms']):>12}")
+            exponent = self.growth_exponent([(pages, m['cached_ms']) for pages, m in by_pages.items()])
+            if exponent is not None:
+                print(f"Total time grows ~pages^{exponent:.2f}")
+        if self.measurements:
+            print("Per page includes the 200 ms pause PDFViewer takes between pages")
+
+        labels = list(self.measurements)
+        if len(labels) > 1:
+            print(f"\n{Colors.BLUE}Per-page cost by resolution (ms){Colors.END}")
+            print(f"{'Pages':>6}" + "".join(f"{label:>14}" for label in labels))
+            for pages in self.page_counts:
+                print(f"{pages:>6}" + "".join(
+                    f"{fmt(self.measurements[label].get(pages, {}).get('per_page_ms'), 1, 0):>14}" for label in labels
+                ))
+
+def parse_resolution(value):
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height)
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Navy Display System - PDF Rendering Benchmark. Active PLASA documents are switched off "
+                    "while it runs and restored afterwards."
+    )
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--pages", default="1,10,50,100,200", metavar="LIST",
+                        help="Edition sizes to render (default: 1,10,50,100,200)")
+    parser.add_argument("--resolutions", default="1920x1080", metavar="LIST",
+                        help="Display window sizes; PDFViewer renders pages to the display width "
+                             "(default: 1920x1080, e.g. 1280x720,1920x1080,3840x2160)")
+    parser.add_argument("--page-bytes", type=int, default=20000, metavar="BYTES",
+                        help="Size of each synthetic PDF page (default: 20000)")
+    parser.add_argument("--timeout-per-page", type=float, default=5.0, metavar="SECONDS",
+                        help="Time allowed per page before an edition is given up on (default: 5)")
+    parser.add_argument("--keep-files", action="store_true",
+                        help="Leave uploaded PDFs and cached page images on the server")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and measurements to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    try:
+        page_counts = [int(value) for value in args.pages.split(",") if value.strip()]
+        resolutions = [parse_resolution(value) for value in args.resolutions.split(",") if value.strip()]
+    except ValueError:
+        parser.error("--pages takes integers and --resolutions WIDTHxHEIGHT values")
+    if not page_counts or min(page_counts) < 1:
+        parser.error("--pages must be positive")
+
+    print(f"{Colors.CYAN}Navy Display System - PDF Rendering Benchmark{Colors.END}")
+    print(f"{Colors.CYAN}{'='*46}{Colors.END}")
+
+    benchmark = PdfRenderBenchmark(
+        args.base_url, page_counts, resolutions, args.page_bytes, args.timeout_per_page, args.keep_files
+    )
+    try:
+        benchmark.run()
+    except Exception as e:
+        benchmark.results.add_result("PDF Render: setup", False, str(e))
+    benchmark.print_report()
+    benchmark.results.print_summary()
+    if args.json:
+        benchmark.results.export_json(args.json)
+    sys.exit(0 if benchmark.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Real-time Propagation Latency Test
+Changes a document and times each hop until N display browsers have re-rendered:
+write -> NOTIFY documents_changed/broadcast -> SSE arrival -> /api/documents refetch -> DOM mutation
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from test_selenium import Colors, LatencyStats, NavyDisplayTester, TestResults
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+# Installed before the app's scripts run: timestamps (epoch ms) every message on
+# the documents stream and every DOM mutation that adds, removes or points at the
+# probe document, recognised by its title or file name once `probe` is set
+PROPAGATION_HOOK_JS = """
+(function () {
+    if (window.__navyPropagation) return;
+    var log = window.__navyPropagation = {events: [], mutations: [], probe: null};
+    function now() { return performance.timeOrigin + performance.now(); }
+    var NativeEventSource = window.EventSource;
+    function TimedEventSource(url, config) {
+        var source = new NativeEventSource(url, config);
+        if (String(url).indexOf('/api/documents/stream') !== -1) {
+            source.addEventListener('message', function (event) {
+                var at = now(), data = {};
+                try { data = JSON.parse(event.data); } catch (e) {}
+                log.events.push({type: data.type || null, serverTimestamp: data.timestamp || null, at: at});
+            });
+        }
+        return source;
+    }
+    TimedEventSource.prototype = NativeEventSource.prototype;
+    TimedEventSource.CONNECTING = 0;
+    TimedEventSource.OPEN = 1;
+    TimedEventSource.CLOSED = 2;
+    window.EventSource = TimedEventSource;
+    function mentions(value) {
+        return !!value && log.probe.some(function (needle) { return String(value).indexOf(needle) !== -1; });
+    }
+    function linksProbe(element) {
+        return mentions(element.getAttribute('src')) || mentions(element.getAttribute('href'))
+            || mentions(element.getAttribute('data'));
+    }
+    function showsProbe(node) {
+        if (node.nodeType === 3) return mentions(node.data);
+        if (node.nodeType !== 1) return false;
+        return mentions(node.textContent) || linksProbe(node)
+            || Array.prototype.some.call(node.querySelectorAll('[src], [href], [data]'), linksProbe);
+    }
+    new MutationObserver(function (records) {
+        if (!log.probe) return;
+        var at = now();
+        var rendered = records.some(function (record) {
+            if (record.type === 'attributes') {
+                return mentions(record.target.getAttribute(record.attributeName)) || mentions(record.oldValue);
+            }
+            if (record.type === 'characterData') return mentions(record.target.data) || mentions(record.oldValue);
+            return Array.prototype.some.call(record.addedNodes, showsProbe)
+                || Array.prototype.some.call(record.removedNodes, showsProbe);
+        });
+        if (rendered) {
+            log.mutations.push(at);
+            if (log.mutations.length > 5000) log.mutations.splice(0, 1000);
+        }
+    }).observe(document, {
+        childList: true, subtree: true, characterData: true, characterDataOldValue: true,
+        attributes: true, attributeOldValue: true
+    });
+})();
+"""
+
+# Everything a browser logged after `since` (epoch ms): the first update event,
+# the first /api/documents fetch that completed after it, and the mutations
+COLLECT_JS = """
+var since = arguments[0], log = window.__navyPropagation;
+var origin = performance.timeOrigin;
+var event = log.events.filter(function (e) { return e.type === 'update' && e.at >= since; })[0] || null;
+var refetch = null;
+if (event) {
+    (window.__navyNetwork || []).forEach(function (entry) {
+        var start = origin + entry.start;
+        if (!refetch && entry.method === 'GET' && /\\/api\\/documents(\\?|$)/.test(entry.url)
+                && start >= event.at && entry.end !== null) {
+            refetch = {start: start, end: origin + entry.end};
+        }
+    });
+}
+return {
+    event: event,
+    refetch: refetch,
+    mutations: log.mutations.filter(function (t) { return t >= since; })
+};
+"""
+
+HOPS = ["write -> broadcast", "broadcast -> SSE", "SSE -> refetch", "refetch -> DOM", "write -> DOM"]
+
+def parse_timestamp(value):
+    """Server ISO timestamp (Date.toISOString) as epoch ms"""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000
+    except (AttributeError, ValueError):
+        return None
+
+class PropagationTest:
+    """Toggles a probe document and follows the change into every display browser"""
+
+    def __init__(self, base_url, browsers=3, iterations=10, via="api", interval=3.0, probe_type="escala",
+                 budget_ms=None, database_url=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.browsers = browsers
+        self.iterations = iterations
+        self.via = via
+        self.interval = interval
+        self.probe_type = probe_type
+        self.budget_ms = budget_ms
+        self.database_url = database_url or os.environ.get("DATABASE_URL")
+        self.session = requests.Session()
+        self.tester = NavyDisplayTester(base_url)
+        self.drivers = []
+        self.probe_id = None
+        self.active = False
+        self.connection = None
+        self.stats = {hop: LatencyStats() for hop in HOPS}
+        self.missed = {'event': 0, 'refetch': 0, 'render': 0}
+        self.results = TestResults()
+
+    # Setup
+
+    def open_displays(self):
+        def open_display(_):
+            driver = self.tester.create_driver()
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PROPAGATION_HOOK_JS})
+            driver.get(self.base_url)
+            return driver
+
+        with ThreadPoolExecutor(max_workers=self.browsers) as executor:
+            self.drivers = list(executor.map(open_display, range(self.browsers)))
+
+        # Subscribed once the snapshot has arrived
+        deadline = time.time() + 30
+        for driver in self.drivers:
+            while not driver.execute_script(
+                "return (window.__navyPropagation.events || []).some(function (e) { return e.type === 'snapshot'; });"
+            ):
+                if time.time() > deadline:
+                    raise RuntimeError("A display never received the documents snapshot")
+                time.sleep(0.1)
+
+    def create_probe(self):
+        title = f"Propagation probe {int(time.time())}"
+        response = self.session.post(f"{self.api_url}/documents", json={
+            'title': title,
+            'url': f"/uploads/{self.probe_type}/propagation-probe.pdf",
+            'type': self.probe_type,
+            'active': False,
+            'tags': ["propagation-probe"],
+        }, timeout=10)
+        response.raise_for_status()
+        self.probe_id = response.json()['id']
+        # Only mutations mentioning the probe count as its render; converted
+        # pages keep the file name, so match that as well as the title
+        for driver in self.drivers:
+            driver.execute_script("window.__navyPropagation.probe = arguments[0];", [title, "propagation-probe"])
+        if self.via == "sql":
+            self.connection = psycopg2.connect(self.database_url)
+            self.connection.autocommit = True
+
+    def write(self):
+        """Flip the probe's active flag; the documents trigger turns either path into a NOTIFY"""
+        self.active = not self.active
+        if self.via == "sql":
+            with self.connection.cursor() as cursor:
+                cursor.execute("UPDATE documents SET active = %s WHERE id = %s", (self.active, self.probe_id))
+        else:
+            self.session.put(
+                f"{self.api_url}/documents/{self.probe_id}", json={'active': self.active}, timeout=10
+            ).raise_for_status()
+
+    def cleanup(self):
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if self.connection is not None:
+            self.connection.close()
+        if self.probe_id is not None:
+            try:
+                self.session.delete(f"{self.api_url}/documents/{self.probe_id}", timeout=10)
+            except requests.exceptions.RequestException:
+                pass
+
+    # Measurement
+
+    def record(self, written, observed):
+        """Split one browser's view of one write into hops (all in epoch ms)"""
+        event = observed['event']
+        if not event:
+            self.missed['event'] += 1
+            return
+        broadcast = parse_timestamp(event['serverTimestamp'])
+        if broadcast is not None:
+            self.stats["write -> broadcast"].add((broadcast - written) / 1000)
+            self.stats["broadcast -> SSE"].add((event['at'] - broadcast) / 1000)
+
+        refetch = observed['refetch']
+        if refetch:
+            self.stats["SSE -> refetch"].add((refetch['end'] - event['at']) / 1000)
+        else:
+            self.missed['refetch'] += 1
+        ready = refetch['end'] if refetch else event['at']
+        rendered = next((t for t in observed['mutations'] if t >= ready), None)
+        if rendered is None:
+            self.missed['render'] += 1
+            return
+        self.stats["refetch -> DOM"].add((rendered - ready) / 1000)
+        self.stats["write -> DOM"].add((rendered - written) / 1000)
+
+    def run(self):
+        try:
+            print(f"{Colors.YELLOW}Opening {self.browsers} display browser(s)...{Colors.END}")
+            self.open_displays()
+            self.create_probe()
+            # The probe's own creation is a change too; let it settle first
+            time.sleep(self.interval)
+            for iteration in range(self.iterations):
+                written = time.time() * 1000
+                self.write()
+                time.sleep(self.interval)
+                for driver in self.drivers:
+                    self.record(written, driver.execute_script(COLLECT_JS, written))
+                print(f"Write {iteration + 1}/{self.iterations}: "
+                      f"{self.stats['write -> DOM'].count} render(s) observed so far")
+        finally:
+            self.cleanup()
+        self.evaluate()
+
+    def evaluate(self):
+        expected = self.browsers * self.iterations
+        summaries = {hop: stats.summary(0) for hop, stats in self.stats.items() if stats.count}
+        self.results.add_result(
+            "Propagation: SSE delivery", self.missed['event'] == 0,
+            f"{expected - self.missed['event']}/{expected} updates reached the displays"
+        )
+        total = summaries.get("write -> DOM")
+        if self.budget_ms is not None:
+            passed = total is not None and total['p95_ms'] <= self.budget_ms
+            detail = f"p95 {total['p95_ms']:.0f} ms" if total else "no render observed"
+            self.results.add_result("Propagation: write -> DOM budget", passed, f"{detail} (budget {self.budget_ms:.0f} ms)")
+        self.results.add_benchmark("propagation", dict(summaries, missed=self.missed))
+        return summaries
+
+    def print_report(self):
+        print(f"\n{Colors.BLUE}Propagation Latency by Hop (ms){Colors.END}")
+        print(f"{Colors.BLUE}{'='*31}{Colors.END}")
+        print(f"{'Hop':<22}{'Count':>7}{'p50':>9}{'p95':>9}{'max':>9}")
+        slowest = None
+        for hop in HOPS:
+            stats = self.stats[hop]
+            if not stats.count:
+                print(f"{hop:<22}{0:>7}{'-':>9}{'-':>9}{'-':>9}")
+                continue
+            p50 = stats.percentile(50) * 1000
+            print(f"{hop:<22}{stats.count:>7}{p50:>9.1f}{stats.percentile(95) * 1000:>9.1f}"
+                  f"{stats.percentile(100) * 1000:>9.1f}")
+            if hop != "write -> DOM" and (slowest is None or p50 > slowest[1]):
+                slowest = (hop, p50)
+        if slowest:
+            print(f"Slowest hop: {Colors.YELLOW}{slowest[0]}{Colors.END} ({slowest[1]:.1f} ms median)")
+        if self.missed['render']:
+            print(f"{Colors.YELLOW}{self.missed['render']} update(s) never added or removed the probe document; "
+                  f"the displays may not show {self.probe_type} documents{Colors.END}")
+        print("Hops against the server timestamp assume the server and this machine share a clock")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Navy Display System - Real-time Propagation Latency Test. Creates an inactive probe "
+                    "document, toggles its active flag and deletes it afterwards."
+    )
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--browsers", type=int, default=3, metavar="N",
+                        help="Headless display browsers to follow the change into (default: 3)")
+    parser.add_argument("--iterations", type=int, default=10, metavar="N",
+                        help="Writes to time (default: 10)")
+    parser.add_argument("--via", choices=["api", "sql"], default="api",
+                        help="Write through PUT /api/documents or straight into PostgreSQL "
+                             "(sql needs psycopg2 and DATABASE_URL) (default: api)")
+    parser.add_argument("--interval", type=float, default=3.0, metavar="SECONDS",
+                        help="Time each write is given to reach every display (default: 3)")
+    parser.add_argument("--probe-type", choices=["plasa", "escala", "cardapio"], default="escala",
+                        help="Document type of the probe (default: escala)")
+    parser.add_argument("--budget-ms", type=float, metavar="MS",
+                        help="Fail if p95 write -> DOM latency exceeds this")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and hop summaries to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    if args.browsers < 1 or args.iterations < 1:
+        parser.error("--browsers and --iterations must be at least 1")
+    if args.via == "sql":
+        if psycopg2 is None:
+            parser.error("--via sql needs psycopg2 (pip install psycopg2-binary)")
+        if not os.environ.get("DATABASE_URL"):
+            parser.error("--via sql needs DATABASE_URL")
+
+    print(f"{Colors.CYAN}Navy Display System - Real-time Propagation Latency Test{Colors.END}")
+    print(f"{Colors.CYAN}{'='*56}{Colors.END}")
+
+    test = PropagationTest(
+        args.base_url, args.browsers, args.iterations, args.via, args.interval, args.probe_type, args.budget_ms
+    )
+    try:
+        test.run()
+    except Exception as e:
+        test.results.add_result("Propagation: setup", False, str(e))
+    test.print_report()
+    test.results.print_summary()
+    if args.json:
+        test.results.export_json(args.json)
+    sys.exit(0 if test.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - SSE Reconnection Storm Benchmark
+Keeps hundreds of display-like stream clients connected, then restarts the server
+or drops its LISTEN connection, and measures how long until every client has
+resynced, the peak request rate of the herd and the peak database load
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from sse_load_test import SseSubscriber, raise_fd_limit
+from test_selenium import Colors, LatencyStats, TestResults
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+class StormClient:
+    """One display: reconnects after RECONNECT_DELAY like DisplayContext and refetches documents on every event"""
+
+    def __init__(self, test):
+        self.test = test
+        self.attempts = []
+        self.disconnects = []
+        self.snapshots = []
+        self.updates = []
+
+    def on_event(self, arrived, event_type, data):
+        if event_type == "snapshot":
+            self.snapshots.append(arrived)
+        elif event_type == "update":
+            self.updates.append(arrived)
+        if self.test.refetch and event_type in ("snapshot", "update"):
+            self.test.refetch_documents()
+
+    async def run(self):
+        while not self.test.stopping:
+            self.attempts.append(time.perf_counter())
+            self.test.requests.append(self.attempts[-1])
+            subscriber = SseSubscriber(self.test.base_url, "documents", self.on_event)
+            self.test.open_subscribers.add(subscriber)
+            try:
+                await subscriber.run()
+            finally:
+                self.test.open_subscribers.discard(subscriber)
+            if self.test.stopping:
+                return
+            self.disconnects.append(time.perf_counter())
+            await asyncio.sleep(self.test.reconnect_delay + random.uniform(0, self.test.jitter))
+
+    def resynced_after(self, since):
+        """When this client next had a fresh snapshot after `since`"""
+        return next((t for t in self.snapshots if t >= since), None)
+
+    def updated_after(self, since):
+        return next((t for t in self.updates if t >= since), None)
+
+class DatabaseSampler:
+    """Active queries and transactions per second from pg_stat_activity / pg_stat_database"""
+
+    def __init__(self, database_url, interval=0.25):
+        self.database_url = database_url
+        self.interval = interval
+        self.samples = []
+
+    def take_sample(self, cursor):
+        cursor.execute(
+            "SELECT count(*) FILTER (WHERE state = 'active' AND pid <> pg_backend_pid()), count(*) "
+            "FROM pg_stat_activity WHERE datname = current_database()"
+        )
+        active, connections = cursor.fetchone()
+        cursor.execute(
+            "SELECT xact_commit + xact_rollback FROM pg_stat_database WHERE datname = current_database()"
+        )
+        return {'t': time.perf_counter(), 'active': active, 'connections': connections, 'xacts': cursor.fetchone()[0]}
+
+    async def run(self):
+        connection = await asyncio.to_thread(psycopg2.connect, self.database_url)
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                while True:
+                    self.samples.append(await asyncio.to_thread(self.take_sample, cursor))
+                    await asyncio.sleep(self.interval)
+        finally:
+            connection.close()
+
+    def peaks(self, since):
+        samples = [s for s in self.samples if s['t'] >= since]
+        if len(samples) < 2:
+            return None
+        rates = [
+            (later['xacts'] - earlier['xacts']) / (later['t'] - earlier['t'])
+            for earlier, later in zip(samples, samples[1:]) if later['t'] > earlier['t']
+        ]
+        return {
+            'active_queries_peak': max(s['active'] for s in samples),
+            'connections_peak': max(s['connections'] for s in samples),
+            'xacts_per_second_peak': max(rates) if rates else 0.0,
+        }
+
+class ReconnectStormTest:
+    """Connect, disrupt, watch the herd come back"""
+    # Pause between listener probes, and how many delivered probes in a row
+    # mean the termination went unnoticed (or healed before the first probe)
+    PROBE_INTERVAL = 0.5
+    PROBE_STREAK = 5
+
+    def __init__(self, base_url, clients=300, disruption="restart", restart_command=None, reconnect_delay=5.0,
+                 jitter=0.0, refetch=True, hold=5, recovery_timeout=120, database_url=None):
+        self.base_url = base_url.rstrip("/")
+        self.api_url = f"{self.base_url}/api"
+        self.client_count = clients
+        self.disruption = disruption
+        self.restart_command = restart_command
+        self.reconnect_delay = reconnect_delay
+        self.jitter = jitter
+        self.refetch = refetch
+        self.hold = hold
+        self.recovery_timeout = recovery_timeout
+        self.database_url = database_url or os.environ.get("DATABASE_URL")
+        self.clients = [StormClient(self) for _ in range(clients)]
+        self.open_subscribers = set()
+        self.stopping = False
+        # Start times of every request the herd made: stream connects and document refetches
+        self.requests = []
+        self.refetch_stats = LatencyStats()
+        self.probes = []
+        # One thread and one pooled connection per client, so refetches go out when
+        # the display would send them instead of queueing on this side
+        self.executor = ThreadPoolExecutor(max_workers=clients)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=clients)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.db_sampler = DatabaseSampler(self.database_url) if psycopg2 and self.database_url else None
+        self.disrupted_at = None
+        self.report = {}
+        self.results = TestResults()
+
+    def refetch_documents(self):
+        def get():
+            started = time.perf_counter()
+            self.requests.append(started)
+            try:
+                ok = self.session.get(f"{self.api_url}/documents", timeout=30).status_code < 400
+            except requests.exceptions.RequestException:
+                ok = False
+            if self.disrupted_at is not None:
+                self.refetch_stats.add(time.perf_counter() - started, ok)
+
+        self.executor.submit(get)
+
+    # Disruptions
+
+    def restart_server(self):
+        subprocess.run(self.restart_command, shell=True, check=True)
+
+    def drop_listener(self):
+        """Terminate the backend holding LISTEN documents_changed; documentsListener reconnects after 5s"""
+        connection = psycopg2.connect(self.database_url)
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE query ILIKE 'LISTEN documents_changed%%' AND pid <> pg_backend_pid()"
+                )
+                if not cursor.fetchall():
+                    raise RuntimeError("no backend is listening on documents_changed")
+        finally:
+            connection.close()
+
+    def probe_write(self):
+        """Rewrite a document unchanged so the trigger NOTIFYs; returns when the API acknowledged it"""
+        documents = self.session.get(f"{self.api_url}/documents", timeout=10).json()
+        if not documents:
+            raise RuntimeError("no documents to update; upload one first")
+        document = documents[0]
+        self.session.put(
+            f"{self.api_url}/documents/{document['id']}", json={'title': document['title']}, timeout=10
+        ).raise_for_status()
+
+    # Run
+
+    async def _wait(self, condition, timeout):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if condition():
+                return True
+            await asyncio.sleep(0.05)
+        return condition()
+
+    async def _probe_listener(self, deadline):
+        """Probe writes until one reaches every connected client again"""
+        streak = 0
+        while time.perf_counter() < deadline:
+            written = time.perf_counter()
+            await asyncio.to_thread(self.probe_write)
+            delivered = await self._wait(lambda: all(c.updated_after(written) for c in self.clients), 1.0)
+            self.probes.append({'t': written, 'delivered': delivered})
+            if delivered and any(not probe['delivered'] for probe in self.probes):
+                return
+            streak = streak + 1 if delivered else 0
+            if streak >= self.PROBE_STREAK:
+                return
+            await asyncio.sleep(self.PROBE_INTERVAL)
+
+    async def run(self):
+        raise_fd_limit()
+        tasks = [asyncio.create_task(client.run()) for client in self.clients]
+        sampler_task = asyncio.create_task(self.db_sampler.run()) if self.db_sampler else None
+        try:
+            print(f"{Colors.YELLOW}Connecting {self.client_count} stream clients...{Colors.END}")
+            connected = await self._wait(lambda: all(c.snapshots for c in self.clients), 60)
+            if not connected:
+                raise RuntimeError(f"only {sum(bool(c.snapshots) for c in self.clients)} clients connected")
+            await asyncio.sleep(self.hold)
+
+            print(f"{Colors.YELLOW}Disrupting: {self.disruption}{Colors.END}")
+            self.disrupted_at = time.perf_counter()
+            deadline = self.disrupted_at + self.recovery_timeout
+            if self.disruption == "restart":
+                await asyncio.to_thread(self.restart_server)
+                # Resynced = dropped and then received a fresh snapshot
+                await self._wait(lambda: all(
+                    c.disconnects and c.resynced_after(c.disconnects[-1]) for c in self.clients
+                ), self.recovery_timeout)
+            else:
+                await asyncio.to_thread(self.drop_listener)
+                await self._probe_listener(deadline)
+        finally:
+            self.stopping = True
+            for subscriber in list(self.open_subscribers):
+                subscriber.close()
+            for task in tasks + ([sampler_task] if sampler_task else []):
+                task.cancel()
+            await asyncio.gather(*tasks, *([sampler_task] if sampler_task else []), return_exceptions=True)
+            self.executor.shutdown(wait=True)
+        self.evaluate()
+
+    # Analysis
+
+    def evaluate(self):
+        t0 = self.disrupted_at
+        resync = LatencyStats()
+        if self.disruption == "restart":
+            for client in self.clients:
+                dropped = [t for t in client.disconnects if t >= t0]
+                back = client.resynced_after(dropped[0]) if dropped else None
+                resync.add(back - t0 if back else None, back is not None)
+        else:
+            lost = next((probe['t'] for probe in self.probes if not probe['delivered']), None)
+            for client in self.clients:
+                back = client.updated_after(lost) if lost else t0
+                resync.add(back - t0 if back else None, back is not None)
+
+        after = sorted(t - t0 for t in self.requests if t >= t0)
+        per_second = {}
+        for t in after:
+            per_second[int(t)] = per_second.get(int(t), 0) + 1
+        per_tenth = {}
+        for t in after:
+            per_tenth[int(t * 10)] = per_tenth.get(int(t * 10), 0) + 1
+
+        self.report = {
+            'resync': resync.summary(1),
+            'all_resynced_s': max(resync.samples) if resync.samples and not resync.errors else None,
+            'reconnect_attempts': sum(len([t for t in c.attempts if t >= t0]) for c in self.clients),
+            'peak_requests_per_second': max(per_second.values()) if per_second else 0,
+            'peak_requests_per_100ms': max(per_tenth.values()) if per_tenth else 0,
+            'refetch': self.refetch_stats.summary(1),
+            'database': self.db_sampler.peaks(t0) if self.db_sampler else None,
+            'listener_probes': len(self.probes),
+        }
+        detail = (f"all {self.client_count} back after {self.report['all_resynced_s']:.1f}s"
+                  if self.report['all_resynced_s'] is not None
+                  else f"{resync.errors}/{self.client_count} not resynced within {self.recovery_timeout:.0f}s")
+        self.results.add_result(f"Storm ({self.disruption}): clients resynced", resync.errors == 0, detail)
+        refetch = self.report['refetch']
+        if refetch['requests']:
+            self.results.add_result(
+                f"Storm ({self.disruption}): document refetches", refetch['errors'] == 0,
+                f"{refetch['requests']} refetches, {refetch['errors']} failed, p95 {refetch['p95_ms']:.0f} ms"
+            )
+        self.results.add_benchmark(f"reconnect-storm {self.disruption}", self.report)
+
+    def print_report(self):
+        if not self.report:
+            return
+        print(f"\n{Colors.BLUE}Reconnection Storm ({self.disruption}, {self.client_count} clients){Colors.END}")
+        print(f"{Colors.BLUE}{'='*30}{Colors.END}")
+        resync = self.report['resync']
+        print(f"Resync after disruption: p50 {resync['p50_ms'] / 1000:.2f}s, p95 {resync['p95_ms'] / 1000:.2f}s, "
+              f"max {resync['max_ms'] / 1000:.2f}s ({resync['errors']} never)")
+        print(f"Reconnect attempts: {self.report['reconnect_attempts']}")
+        print(f"Peak herd request rate: {self.report['peak_requests_per_second']}/s "
+              f"({self.report['peak_requests_per_100ms']} in the busiest 100 ms)")
+        refetch = self.report['refetch']
+        if refetch['requests']:
+            print(f"Document refetches: {refetch['requests']}, p50 {refetch['p50_ms']:.0f} ms, "
+                  f"p95 {refetch['p95_ms']:.0f} ms, max {refetch['max_ms']:.0f} ms")
+        database = self.report['database']
+        if database:
+            print(f"Database: peak {database['active_queries_peak']} active queries, "
+                  f"{database['connections_peak']} connections, {database['xacts_per_second_peak']:.0f} xacts/s")
+        else:
+            print(f"{Colors.YELLOW}Database load not sampled (needs psycopg2 and DATABASE_URL){Colors.END}")
+        if self.disruption == "listener":
+            lost = sum(not probe['delivered'] for probe in self.probes)
+            print(f"Listener probes: {len(self.probes)} written, {lost} not delivered while LISTEN was down")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - SSE Reconnection Storm Benchmark")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--clients", type=int, default=300, metavar="N",
+                        help="Display-like stream clients (default: 300)")
+    parser.add_argument("--disrupt", choices=["restart", "listener"], default="restart",
+                        help="restart: run --restart-command; listener: terminate the server's LISTEN "
+                             "documents_changed backend (needs psycopg2 and DATABASE_URL) (default: restart)")
+    parser.add_argument("--restart-command", metavar="CMD",
+                        help="Shell command that restarts the server, e.g. 'pm2 restart ecosystem.config.js'")
+    parser.add_argument("--reconnect-delay", type=float, default=5.0, metavar="SECONDS",
+                        help="Client reconnect delay; DisplayContext uses 5s (default: 5)")
+    parser.add_argument("--jitter", type=float, default=0.0, metavar="SECONDS",
+                        help="Random extra reconnect delay per client, to try spreading the herd (default: 0)")
+    parser.add_argument("--no-refetch", action="store_true",
+                        help="Don't GET /api/documents after each event the way DisplayContext does")
+    parser.add_argument("--hold", type=float, default=5, metavar="SECONDS",
+                        help="Idle time with every client connected before disrupting (default: 5)")
+    parser.add_argument("--recovery-timeout", type=float, default=120, metavar="SECONDS",
+                        help="How long clients get to resync (default: 120)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and the storm report to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    if args.disrupt == "restart" and not args.restart_command:
+        parser.error("--disrupt restart needs --restart-command")
+    if args.disrupt == "listener" and (psycopg2 is None or not os.environ.get("DATABASE_URL")):
+        parser.error("--disrupt listener needs psycopg2 and DATABASE_URL")
+
+    limit = raise_fd_limit()
+    if args.clients + 64 > limit:
+        print(f"{Colors.YELLOW}Open file limit is {limit}; some connections may fail{Colors.END}")
+
+    print(f"{Colors.CYAN}Navy Display System - SSE Reconnection Storm{Colors.END}")
+    print(f"{Colors.CYAN}{'='*44}{Colors.END}")
+
+    test = ReconnectStormTest(
+        args.base_url, args.clients, args.disrupt, args.restart_command, args.reconnect_delay, args.jitter,
+        not args.no_refetch, args.hold, args.recovery_timeout
+    )
+    try:
+        asyncio.run(test.run())
+    except Exception as e:
+        test.results.add_result(f"Storm ({args.disrupt}): setup", False, str(e))
+    test.print_report()
+    test.results.print_summary()
+    if args.json:
+        test.results.export_json(args.json)
+    sys.exit(0 if test.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()
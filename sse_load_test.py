@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - SSE Fan-out Load Tester
+Holds hundreds to thousands of display subscriptions open on the SSE streams
+and measures snapshot time and broadcast delivery latency
+"""
+
+import sys
+import ssl
+import time
+import asyncio
+import argparse
+import resource
+from urllib.parse import urlsplit
+
+import requests
+
+from test_selenium import Colors, LatencyStats, TestResults, find_server_pid
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+STREAMS = {
+    "documents": "/api/documents/stream",
+    "duty-officers": "/api/duty-officers/stream",
+}
+
+class SseSubscriber:
+    """One display's subscription to an SSE stream over a raw asyncio connection"""
+
+    def __init__(self, base_url, stream, on_event=None):
+        self.base_url = base_url
+        self.stream = stream
+        self.path = STREAMS[stream]
+        # Called as on_event(arrived, event_type, data) for callers that need the payloads
+        self.on_event = on_event
+        self.snapshot_seconds = None
+        self.updates = []
+        self.error = None
+        self._writer = None
+
+    async def _open(self):
+        parts = urlsplit(self.base_url)
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=ssl.create_default_context() if secure else None
+        )
+        writer.write(
+            f"GET {self.path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            "Accept: text/event-stream\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: keep-alive\r\n\r\n".encode()
+        )
+        await writer.drain()
+        self._writer = writer
+
+        status = await reader.readline()
+        if b" 200 " not in status:
+            raise ConnectionError(f"{self.path} answered {status.decode().strip()}")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        return reader, headers.get("transfer-encoding") == "chunked"
+
+    async def _chunks(self, reader, chunked):
+        """Yield body bytes, undoing chunked transfer encoding when Express uses it"""
+        if not chunked:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                yield data
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+
+    @staticmethod
+    def _event_type(data):
+        # Both streams serialize `type` first; sniffing it avoids parsing every
+        # full snapshot in the client loop, which would skew the latencies
+        head = data[:40]
+        for event_type in ("snapshot", "update", "view-state"):
+            if f'"type":"{event_type}"' in head:
+                return event_type
+        return None
+
+    async def run(self):
+        started = time.perf_counter()
+        try:
+            reader, chunked = await self._open()
+            buffer = ""
+            async for chunk in self._chunks(reader, chunked):
+                buffer += chunk.decode("utf-8", errors="replace")
+                while "\n\n" in buffer:
+                    block, buffer = buffer.split("\n\n", 1)
+                    data = "\n".join(
+                        line[5:].lstrip() for line in block.split("\n") if line.startswith("data:")
+                    )
+                    if not data:
+                        continue  # heartbeat comment
+                    arrived = time.perf_counter()
+                    event_type = self._event_type(data)
+                    if event_type == "snapshot" and self.snapshot_seconds is None:
+                        self.snapshot_seconds = arrived - started
+                    elif event_type is not None:
+                        self.updates.append((arrived, event_type))
+                    if self.on_event is not None:
+                        self.on_event(arrived, event_type, data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = str(e) or e.__class__.__name__
+
+    def delivered_after(self, since):
+        """Arrival time of the first update received after `since`, if any"""
+        for arrived, event_type in self.updates:
+            if arrived >= since and event_type == "update":
+                return arrived
+        return None
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+class ProcessSampler:
+    """Samples RSS and CPU of the server process tree while load is held"""
+
+    def __init__(self, pid, interval=0.5):
+        self.process = psutil.Process(pid)
+        self.interval = interval
+        self.samples = []
+
+    def _tree(self):
+        try:
+            return [self.process] + self.process.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    async def run(self):
+        for proc in self._tree():
+            proc.cpu_percent(None)
+        while True:
+            await asyncio.sleep(self.interval)
+            rss = cpu = 0.0
+            for proc in self._tree():
+                try:
+                    rss += proc.memory_info().rss
+                    cpu += proc.cpu_percent(None)
+                except psutil.NoSuchProcess:
+                    continue
+            self.samples.append((time.perf_counter(), rss, cpu))
+
+    def summary(self):
+        if not self.samples:
+            return None
+        rss = [sample[1] for sample in self.samples]
+        cpu = [sample[2] for sample in self.samples]
+        return {
+            'rss_start_mb': rss[0] / 1048576,
+            'rss_peak_mb': max(rss) / 1048576,
+            'cpu_mean_pct': sum(cpu) / len(cpu),
+            'cpu_peak_pct': max(cpu),
+        }
+
+def raise_fd_limit():
+    """Each subscription is a socket; lift the soft descriptor limit to the hard one"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+class SseFanoutTest:
+    """Opens many stream subscribers, triggers writes and times the fan-out"""
+
+    def __init__(self, base_url, clients=200, streams=None, writes=3, connect_concurrency=100,
+                 hold=5, delivery_timeout=15, server_pid=None):
+        self.base_url = base_url.rstrip("/")
+        self.api_url = f"{self.base_url}/api"
+        self.clients = clients
+        self.streams = streams or list(STREAMS)
+        self.writes = writes
+        self.connect_concurrency = connect_concurrency
+        self.hold = hold
+        self.delivery_timeout = delivery_timeout
+        self.server_pid = server_pid or find_server_pid(self.base_url)
+        self.subscribers = {stream: [] for stream in self.streams}
+        self.snapshot_stats = {stream: LatencyStats() for stream in self.streams}
+        self.delivery_stats = {stream: LatencyStats() for stream in self.streams}
+        self.sampler = None
+
+    def trigger_write(self, stream):
+        """Write unchanged data back so the server broadcasts without altering content"""
+        if stream == "duty-officers":
+            officers = requests.get(f"{self.api_url}/duty-officers", timeout=10).json().get("officers") or {}
+            payload = {key: officers.get(key) for key in ("officerName", "officerRank", "masterName", "masterRank")}
+            response = requests.put(f"{self.api_url}/duty-officers", json=payload, timeout=10)
+        else:
+            documents = requests.get(f"{self.api_url}/documents", timeout=10).json()
+            if not documents:
+                raise RuntimeError("no documents to update; upload one first")
+            document = documents[0]
+            response = requests.put(
+                f"{self.api_url}/documents/{document['id']}", json={"title": document["title"]}, timeout=10
+            )
+        response.raise_for_status()
+
+    async def _connect_all(self):
+        gate = asyncio.Semaphore(self.connect_concurrency)
+        tasks = []
+
+        async def start(subscriber):
+            async with gate:
+                task = asyncio.create_task(subscriber.run())
+                tasks.append(task)
+                # Hold the gate until the snapshot lands so connects are paced
+                deadline = time.perf_counter() + self.delivery_timeout
+                while subscriber.snapshot_seconds is None and subscriber.error is None and not task.done():
+                    if time.perf_counter() > deadline:
+                        break
+                    await asyncio.sleep(0.01)
+
+        starters = []
+        for stream in self.streams:
+            for _ in range(self.clients):
+                subscriber = SseSubscriber(self.base_url, stream)
+                self.subscribers[stream].append(subscriber)
+                starters.append(start(subscriber))
+        await asyncio.gather(*starters)
+        return tasks
+
+    async def _measure_delivery(self, stream):
+        subscribers = [s for s in self.subscribers[stream] if s.snapshot_seconds is not None and s.error is None]
+        written = time.perf_counter()
+        await asyncio.to_thread(self.trigger_write, stream)
+
+        deadline = written + self.delivery_timeout
+        while time.perf_counter() < deadline:
+            if all(s.delivered_after(written) is not None for s in subscribers):
+                break
+            await asyncio.sleep(0.02)
+
+        stats = self.delivery_stats[stream]
+        for subscriber in subscribers:
+            arrived = subscriber.delivered_after(written)
+            stats.add(arrived - written if arrived is not None else None, arrived is not None)
+
+    async def run(self):
+        tasks = []
+        sampler_task = None
+        if self.server_pid and psutil is not None:
+            self.sampler = ProcessSampler(self.server_pid)
+            sampler_task = asyncio.create_task(self.sampler.run())
+
+        try:
+            tasks = await self._connect_all()
+            for stream, subscribers in self.subscribers.items():
+                for subscriber in subscribers:
+                    self.snapshot_stats[stream].add(subscriber.snapshot_seconds, subscriber.snapshot_seconds is not None)
+
+            await asyncio.sleep(self.hold)
+
+            for stream in self.streams:
+                for _ in range(self.writes):
+                    try:
+                        await self._measure_delivery(stream)
+                    except Exception as e:
+                        print(f"{Colors.RED}Failed to trigger {stream} update: {e}{Colors.END}")
+                        self.delivery_stats[stream].add(None, False)
+                        break
+                    await asyncio.sleep(1)
+        finally:
+            for subscribers in self.subscribers.values():
+                for subscriber in subscribers:
+                    subscriber.close()
+            if sampler_task:
+                tasks.append(sampler_task)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def print_report(self):
+        print(f"\n{Colors.BLUE}SSE Fan-out Results ({self.clients} clients per stream){Colors.END}")
+        print(f"{Colors.BLUE}{'='*30}{Colors.END}")
+        print(f"{'Stream':<16}{'Measure':<12}{'OK':>7}{'Fail':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for stream in self.streams:
+            for label, stats in (("snapshot", self.snapshot_stats[stream]), ("delivery", self.delivery_stats[stream])):
+                summary = stats.summary(1)
+                color = Colors.RED if summary['errors'] else Colors.END
+                print(
+                    f"{color}{stream:<16}{label:<12}{len(stats.samples):>7}{summary['errors']:>6}"
+                    f"{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}"
+                    f"{summary['max_ms']:>9.1f}{Colors.END}"
+                )
+
+        errors = {}
+        for subscribers in self.subscribers.values():
+            for subscriber in subscribers:
+                if subscriber.error:
+                    errors[subscriber.error] = errors.get(subscriber.error, 0) + 1
+        for message, count in errors.items():
+            print(f"{Colors.RED}{count} subscriber(s): {message}{Colors.END}")
+
+        resources = self.sampler.summary() if self.sampler else None
+        if resources:
+            print(f"\n{Colors.BLUE}Server Resources (pid {self.server_pid}){Colors.END}")
+            print(f"RSS: {resources['rss_start_mb']:.1f} MB -> peak {resources['rss_peak_mb']:.1f} MB")
+            print(f"CPU: mean {resources['cpu_mean_pct']:.1f}% / peak {resources['cpu_peak_pct']:.1f}%")
+        else:
+            print(f"{Colors.YELLOW}Server resources not sampled (psutil missing or server pid not found){Colors.END}")
+
+    def to_results(self):
+        """Results in the suite's format so runs can be exported and compared to a baseline"""
+        results = TestResults()
+        summaries = {}
+        for stream in self.streams:
+            for label, stats in (("snapshot", self.snapshot_stats[stream]), ("delivery", self.delivery_stats[stream])):
+                summaries[f"{stream} {label}"] = stats.summary(1)
+                results.add_result(
+                    f"SSE {stream} {label}", stats.errors == 0,
+                    f"{len(stats.samples)} received, {stats.errors} missing"
+                )
+        resources = self.sampler.summary() if self.sampler else None
+        if resources:
+            summaries['server'] = resources
+        results.add_benchmark("sse-fanout", summaries)
+        return results
+
+    def passed(self):
+        return all(
+            stats.errors == 0
+            for stats_by_stream in (self.snapshot_stats, self.delivery_stats)
+            for stats in stats_by_stream.values()
+        )
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - SSE Fan-out Load Tester")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--clients", type=int, default=200, metavar="N",
+                        help="Subscribers opened on each stream (default: 200)")
+    parser.add_argument("--streams", default=",".join(STREAMS), metavar="NAMES",
+                        help="Comma-separated streams to load: documents,duty-officers")
+    parser.add_argument("--writes", type=int, default=3, metavar="N",
+                        help="Updates triggered per stream to time delivery (default: 3)")
+    parser.add_argument("--connect-concurrency", type=int, default=100, metavar="N",
+                        help="Connections opened at the same time while ramping up (default: 100)")
+    parser.add_argument("--hold", type=float, default=5, metavar="SECONDS",
+                        help="Idle time with every connection open before writing (default: 5)")
+    parser.add_argument("--delivery-timeout", type=float, default=15, metavar="SECONDS",
+                        help="How long to wait for a snapshot or update to arrive (default: 15)")
+    parser.add_argument("--server-pid", type=int, metavar="PID",
+                        help="Server process to sample (default: process listening on the URL's port)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and latency summaries to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    streams = [name.strip() for name in args.streams.split(",") if name.strip()]
+    unknown = [name for name in streams if name not in STREAMS]
+    if unknown:
+        parser.error(f"unknown stream(s): {', '.join(unknown)}")
+
+    limit = raise_fd_limit()
+    if args.clients * len(streams) + 64 > limit:
+        print(f"{Colors.YELLOW}Open file limit is {limit}; some connections may fail{Colors.END}")
+
+    print(f"{Colors.CYAN}Navy Display System - SSE Fan-out Load Test{Colors.END}")
+    print(f"{Colors.CYAN}{'='*45}{Colors.END}")
+
+    test = SseFanoutTest(
+        args.base_url, args.clients, streams, args.writes, args.connect_concurrency,
+        args.hold, args.delivery_timeout, args.server_pid
+    )
+    asyncio.run(test.run())
+    test.print_report()
+    if args.json:
+        test.to_results().export_json(args.json)
+    sys.exit(0 if test.passed() else 1)
+
+if __name__ == "__main__":
+    main()
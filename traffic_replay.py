@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Traffic Record and Replay
+Records kiosk and admin traffic through a forwarding proxy into a JSONL
+capture, and replays captures against a server at recorded, accelerated or
+fixed-rate pace with per-endpoint latency histograms
+"""
+
+import re
+import sys
+import json
+import time
+import base64
+import argparse
+import threading
+import http.client
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from test_selenium import Colors, LatencyStats, TestResults
+
+# Capture format, one request per line:
+#   {"t": 12.5, "method": "PUT", "path": "/api/duty-officers",
+#    "headers": {"Content-Type": "application/json"}, "body": {...}}
+# `headers` is optional and only needs the ones in RECORDED_HEADERS;
+# `t` is seconds since the capture started (an ISO "timestamp" works too);
+# JSON bodies go in "body", anything else base64-encoded in "body_b64"
+
+HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding", "te", "trailer", "upgrade",
+              "proxy-authorization", "proxy-authenticate", "host", "content-length"}
+
+# Request headers that change what the server sends back, so a replayed 304
+# or range request stays a 304 or range request
+RECORDED_HEADERS = ["Content-Type", "Accept", "If-None-Match", "If-Modified-Since", "Range"]
+
+# Upper bounds in ms; the last bucket is open-ended
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+def endpoint_key(method, path):
+    """Group requests by route: numeric ids and file names collapse into placeholders"""
+    path = path.split("?", 1)[0]
+    if path.startswith("/uploads/"):
+        path = re.sub(r"[^/]+$", "*", path)
+    path = re.sub(r"/\d+(?=/|$)", "/:id", path)
+    path = re.sub(r"/api/check-escala-cache/[^/]+", "/api/check-escala-cache/:id", path)
+    path = re.sub(r"/api/delete-pdf/.+", "/api/delete-pdf/*", path)
+    return f"{method} {path}"
+
+def histogram(samples):
+    counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+    for seconds in samples:
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS) if ms <= bound), len(HISTOGRAM_BUCKETS))
+        counts[index] += 1
+    return counts
+
+def read_capture(path):
+    """Yield (offset seconds, entry) one line at a time so captures of any size replay in constant memory"""
+    origin = None
+    with open(path) as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, dict):
+                    raise TypeError(f"expected a JSON object, got {type(entry).__name__}")
+                if "t" in entry:
+                    stamp = float(entry["t"])
+                elif "timestamp" in entry:
+                    stamp = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00")).timestamp()
+                else:
+                    stamp = None
+            except (ValueError, TypeError, AttributeError) as e:
+                print(f"{Colors.YELLOW}Skipping line {number}: {e}{Colors.END}")
+                continue
+            if not entry.get("method") or not entry.get("path"):
+                print(f"{Colors.YELLOW}Skipping line {number}: method and path are required{Colors.END}")
+                continue
+            if stamp is not None and origin is None:
+                origin = stamp
+            yield (stamp - origin if stamp is not None else 0.0), entry
+
+class TrafficReplay:
+    """Replays a capture open loop: each request goes out at its scheduled time, measured from that time"""
+
+    def __init__(self, base_url, capture, speed=1.0, rate=None, methods=None, max_in_flight=256, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.capture = capture
+        self.speed = speed
+        self.rate = rate
+        self.methods = {method.upper() for method in methods} if methods else None
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+        self.skipped = 0
+        self.lag = LatencyStats()
+        self.elapsed = 0.0
+        # Bounds memory and sockets when the server falls behind; time spent
+        # waiting for a slot still counts against the request's latency
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _stats_for(self, key):
+        with self._stats_lock:
+            if key not in self.stats:
+                self.stats[key] = LatencyStats()
+            return self.stats[key]
+
+    def _send(self, entry, scheduled):
+        method = entry["method"].upper()
+        stats = self._stats_for(endpoint_key(method, entry["path"]))
+        headers = dict(entry.get("headers") or {})
+        kwargs = {}
+        if entry.get("body_b64") is not None:
+            kwargs['data'] = base64.b64decode(entry["body_b64"])
+        elif isinstance(entry.get("body"), (dict, list)):
+            kwargs['json'] = entry["body"]
+        elif entry.get("body") is not None:
+            kwargs['data'] = str(entry["body"]).encode()
+        stream = entry["path"].split("?", 1)[0].endswith("/stream")
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}{entry['path']}", headers=headers,
+                timeout=self.timeout, stream=stream, **kwargs
+            )
+            if stream:
+                # An SSE subscription never ends; time it to the first event
+                for _ in response.iter_lines():
+                    break
+                response.close()
+            else:
+                response.content
+            stats.add(time.perf_counter() - scheduled, response.status_code < 400)
+        except requests.exceptions.RequestException:
+            stats.add(None, False)
+        finally:
+            self._slots.release()
+
+    def run(self):
+        start = time.perf_counter()
+        # Fixed-rate slots go to requests actually sent, so --methods filtering doesn't lower the rate
+        sent = 0
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for offset, entry in read_capture(self.capture):
+                if self.methods and entry["method"].upper() not in self.methods:
+                    self.skipped += 1
+                    continue
+                scheduled = start + (sent / self.rate if self.rate else offset / self.speed)
+                sent += 1
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                self._slots.acquire()
+                self.lag.add(max(0.0, time.perf_counter() - scheduled))
+                executor.submit(self._send, entry, scheduled)
+        self.elapsed = time.perf_counter() - start
+        return self.report()
+
+    def report(self):
+        overall = LatencyStats()
+        summaries = {}
+        for key in sorted(self.stats):
+            overall.merge(self.stats[key])
+            summaries[key] = dict(self.stats[key].summary(self.elapsed), histogram=histogram(self.stats[key].samples))
+        summaries['overall'] = dict(overall.summary(self.elapsed), histogram=histogram(overall.samples))
+        return summaries
+
+    def print_report(self, summaries):
+        pace = f"{self.rate:g} req/s" if self.rate else f"{self.speed:g}x recorded pace"
+        print(f"\n{Colors.BLUE}Traffic Replay ({pace}, {self.elapsed:.1f}s){Colors.END}")
+        print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+        print(f"{'Endpoint':<40}{'Reqs':>7}{'Req/s':>8}{'Err%':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for key, summary in summaries.items():
+            color = Colors.RED if summary['errors'] else Colors.END
+            print(
+                f"{color}{key:<40}{summary['requests']:>7}{summary['throughput']:>8.1f}"
+                f"{summary['error_rate'] * 100:>6.1f}%{summary['p50_ms']:>9.1f}"
+                f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}{Colors.END}"
+            )
+
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS] + [f">{HISTOGRAM_BUCKETS[-1]}ms"]
+        for key, summary in summaries.items():
+            counts = summary['histogram']
+            if not any(counts):
+                continue
+            print(f"\n{key}")
+            peak = max(counts)
+            for label, count in zip(labels, counts):
+                if count:
+                    print(f"  {label:>9} {'#' * max(1, round(count / peak * 40)):<40} {count}")
+
+        if self.skipped:
+            print(f"{Colors.YELLOW}{self.skipped} requests skipped by --methods{Colors.END}")
+        behind = self.lag.percentile(99) * 1000
+        if behind > 50:
+            print(f"{Colors.YELLOW}Replay ran up to {behind:.0f} ms behind schedule (p99); "
+                  f"raise --max-in-flight or lower the pace{Colors.END}")
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Forwards every request to the target and appends it to the capture"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _forward(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+        entry = {'t': round(time.time() - server.started, 3), 'method': self.command, 'path': self.path}
+        recorded = {name: self.headers[name] for name in RECORDED_HEADERS if self.headers.get(name)}
+        if recorded:
+            entry['headers'] = recorded
+        if body:
+            try:
+                if "json" not in content_type:
+                    raise ValueError
+                entry['body'] = json.loads(body)
+            except ValueError:
+                entry['body_b64'] = base64.b64encode(body).decode()
+        server.write(entry)
+
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in HOP_BY_HOP}
+        connection = server.connect()
+        try:
+            connection.request(self.command, self.path, body=body or None, headers=headers)
+            response = connection.getresponse()
+            has_body = self.command != "HEAD" and response.status not in (204, 304) and response.status >= 200
+            self.send_response(response.status, response.reason)
+            for name, value in response.getheaders():
+                if name.lower() not in HOP_BY_HOP:
+                    self.send_header(name, value)
+            # Re-chunk every body so streams (SSE) pass through as they arrive
+            if has_body:
+                self.send_header("Transfer-Encoding", "chunked")
+            else:
+                self.send_header("Content-Length", "0")
+            self.end_headers()
+            if has_body:
+                while True:
+                    data = response.read1(65536)
+                    if not data:
+                        break
+                    self.wfile.write(b"%x\r\n" % len(data) + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+        except (OSError, http.client.HTTPException):
+            self.close_connection = True
+        finally:
+            connection.close()
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = do_OPTIONS = _forward
+
+class RecordingProxy(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, port, target, output):
+        super().__init__(("0.0.0.0", port), RecordingHandler)
+        parts = urlsplit(target)
+        self.target_host = parts.hostname
+        self.target_port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.secure = parts.scheme == "https"
+        self.output = open(output, "a")
+        self.started = time.time()
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def connect(self):
+        connection_class = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+        return connection_class(self.target_host, self.target_port, timeout=300)
+
+    def write(self, entry):
+        with self._lock:
+            self.output.write(json.dumps(entry) + "\n")
+            self.output.flush()
+            self.recorded += 1
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - Traffic Record and Replay")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Proxy traffic to a server and append it to a capture")
+    record.add_argument("capture", help="JSONL capture file to append to")
+    record.add_argument("--target", default="http://localhost:5001",
+                        help="Server to forward to (default: http://localhost:5001)")
+    record.add_argument("--port", type=int, default=5002, help="Port the proxy listens on (default: 5002)")
+
+    replay = commands.add_parser("replay", help="Replay a capture against a server")
+    replay.add_argument("capture", help="JSONL capture file")
+    replay.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    replay.add_argument("--speed", type=float, default=1.0, metavar="FACTOR",
+                        help="Replay pace relative to the recording, e.g. 10 for 10x (default: 1)")
+    replay.add_argument("--rate", type=float, metavar="RPS",
+                        help="Ignore recorded timing and send at a fixed rate (open loop)")
+    replay.add_argument("--methods", metavar="LIST",
+                        help="Only replay these methods, e.g. GET,HEAD against a production server")
+    replay.add_argument("--max-in-flight", type=int, default=256, metavar="N",
+                        help="Requests outstanding at once before the replay falls behind (default: 256)")
+    replay.add_argument("--json", metavar="PATH",
+                        help="Write latency summaries and histograms to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        proxy = RecordingProxy(args.port, args.target, args.capture)
+        print(f"{Colors.CYAN}Recording to {args.capture}: point clients at port {args.port} "
+              f"(forwarding to {args.target}), Ctrl+C to stop{Colors.END}")
+        try:
+            proxy.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            proxy.server_close()
+            proxy.output.close()
+            print(f"\n{Colors.GREEN}Recorded {proxy.recorded} requests{Colors.END}")
+        sys.exit(0)
+
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+    if args.max_in_flight < 1:
+        parser.error("--max-in-flight must be at least 1")
+
+    print(f"{Colors.CYAN}Navy Display System - Traffic Replay{Colors.END}")
+    print(f"{Colors.CYAN}{'='*36}{Colors.END}")
+
+    methods = [method.strip() for method in args.methods.split(",")] if args.methods else None
+    engine = TrafficReplay(args.base_url, args.capture, args.speed, args.rate, methods, args.max_in_flight)
+    summaries = engine.run()
+    engine.print_report(summaries)
+
+    results = TestResults()
+    results.add_benchmark("replay", summaries)
+    overall = summaries['overall']
+    results.add_result("Traffic replay", overall['errors'] == 0,
+                       f"{overall['requests']} requests, {overall['errors']} errors")
+    if args.json:
+        results.export_json(args.json)
+    sys.exit(0 if overall['errors'] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
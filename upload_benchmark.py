@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - Upload Throughput Benchmark
+Pushes synthetic PDFs and rendered page images through the upload and page
+cache endpoints at several concurrency levels
+"""
+
+import os
+import sys
+import time
+import uuid
+import zlib
+import base64
+import struct
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from mock_server import synthetic_pdf
+from test_selenium import Colors, LatencyStats, TestResults
+
+def synthetic_png(width, height, target_bytes):
+    """An RGB PNG of roughly target_bytes: random rows that don't compress, then white"""
+    stride = width * 3
+    noisy_rows = min(height, -(-target_bytes // stride))
+    raw = b"".join(b"\x00" + os.urandom(stride) for _ in range(noisy_rows))
+    raw += (b"\x00" + b"\xff" * stride) * (height - noisy_rows)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+class UploadBenchmark:
+    """Upload and page-cache throughput at increasing concurrency"""
+
+    SCENARIOS = ["upload-pdf", "plasa-pages", "escala-cache"]
+
+    def __init__(self, base_url, levels=(1, 4, 16), iterations=8, scenarios=None, pdf_pages=20,
+                 pdf_page_bytes=150000, page_size=(1240, 1754), page_bytes=350000, escala_bytes=600000,
+                 timeout=120, keep_files=False):
+        self.api_url = f"{base_url}/api"
+        self.levels = list(levels)
+        self.iterations = iterations
+        self.scenarios = scenarios or self.SCENARIOS
+        self.timeout = timeout
+        self.keep_files = keep_files
+        self.run_id = uuid.uuid4().hex[:8]
+        self.created = []
+        # summaries[level][label] and upload volume per level and scenario
+        self.summaries = {}
+        self.volume = {}
+
+        # Generated once: the server's cost, not the client's, is what's measured
+        self.pdf = synthetic_pdf(pdf_pages, pdf_page_bytes, "PLASA BENCHMARK")
+        self.page_count = pdf_pages
+        self.page_image = synthetic_png(page_size[0], page_size[1], page_bytes)
+        # The display exports escalas at landscape orientation as a base64 data URL
+        self.escala_data_url = "data:image/png;base64," + base64.b64encode(
+            synthetic_png(page_size[1], page_size[0], escala_bytes)
+        ).decode()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.levels), pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, stats, path, **kwargs):
+        """POST and record latency; returns the JSON body, or None on failure"""
+        started = time.perf_counter()
+        try:
+            response = self.session.post(f"{self.api_url}{path}", timeout=self.timeout, **kwargs)
+            body = response.json() if response.headers.get("Content-Type", "").startswith("application/json") else {}
+            ok = response.status_code < 400 and body.get('success') is not False
+            stats[path].add(time.perf_counter() - started, ok)
+            return body if ok else None
+        except (requests.exceptions.RequestException, ValueError):
+            stats[path].add(None, False)
+            return None
+
+    def _remember(self, url):
+        if url and url.startswith("/uploads/"):
+            self.created.append(url[len("/uploads/"):])
+
+    # One operation per scenario; each returns the number of bytes it uploaded
+
+    def upload_pdf(self, stats, index):
+        body = self._post(
+            stats, "/upload-pdf",
+            files={'pdf': (f"plasa-benchmark-{self.run_id}-{index}.pdf", self.pdf, "application/pdf")},
+            data={'title': f"Benchmark {self.run_id} {index}", 'type': "plasa"},
+        )
+        if body:
+            self._remember(body['data'].get('url'))
+        return len(self.pdf)
+
+    def cache_plasa_edition(self, stats, index):
+        """What PDFViewer does for a new edition: miss, upload every page in order, hit"""
+        document_id = f"bench-{self.run_id}-{index}"
+        check = {'json': {'totalPages': self.page_count, 'documentId': document_id}}
+        started = time.perf_counter()
+        self._post(stats, "/check-plasa-pages", **check)
+        ok = True
+        for page in range(1, self.page_count + 1):
+            body = self._post(
+                stats, "/upload-plasa-page",
+                files={'file': (f"plasa-page-{page}.png", self.page_image, "image/png")},
+                data={'pageNumber': str(page), 'documentId': document_id},
+            )
+            ok = ok and body is not None
+            if body:
+                self._remember(body['data'].get('url'))
+        cached = self._post(stats, "/check-plasa-pages", **check)
+        ok = ok and bool(cached and cached.get('allPagesExist'))
+        stats['edition'].add(time.perf_counter() - started, ok)
+        return len(self.page_image) * self.page_count
+
+    def save_escala(self, stats, index):
+        body = self._post(
+            stats, "/save-escala-cache",
+            json={'escalId': f"bench-{self.run_id}-{index}", 'imageData': self.escala_data_url},
+        )
+        if body:
+            self._remember(body['data'].get('url'))
+        return len(self.escala_data_url)
+
+    def run_level(self, scenario, level, round_index=0):
+        """Run `iterations` operations of one scenario with `level` of them in flight; `round_index` keeps file names apart"""
+        operation = {
+            "upload-pdf": self.upload_pdf,
+            "plasa-pages": self.cache_plasa_edition,
+            "escala-cache": self.save_escala,
+        }[scenario]
+        labels = {
+            "upload-pdf": ["/upload-pdf"],
+            "plasa-pages": ["/check-plasa-pages", "/upload-plasa-page", "edition"],
+            "escala-cache": ["/save-escala-cache"],
+        }[scenario]
+        stats = {label: LatencyStats() for label in labels}
+        offset = round_index * self.iterations
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as executor:
+            sent = sum(executor.map(lambda i: operation(stats, offset + i), range(self.iterations)))
+        elapsed = time.perf_counter() - start
+
+        for label, label_stats in stats.items():
+            self.summaries.setdefault(level, {})[label] = label_stats.summary(elapsed)
+        self.volume.setdefault(level, {})[scenario] = {
+            'bytes': sent,
+            'seconds': elapsed,
+            'mb_per_s': sent / elapsed / 1048576 if elapsed > 0 else 0.0,
+        }
+
+    def run(self):
+        try:
+            for round_index, level in enumerate(self.levels):
+                for scenario in self.scenarios:
+                    print(f"{Colors.YELLOW}{scenario}: {self.iterations} operations, {level} concurrent...{Colors.END}")
+                    self.run_level(scenario, level, round_index)
+        finally:
+            if not self.keep_files:
+                self.cleanup()
+
+    def cleanup(self):
+        """Delete everything the benchmark stored, one file at a time so real cache entries survive"""
+        removed = 0
+        for relative in self.created:
+            try:
+                response = self.session.delete(f"{self.api_url}/delete-pdf/{relative}", timeout=self.timeout)
+                removed += response.status_code < 400
+            except requests.exceptions.RequestException:
+                pass
+        if self.created:
+            print(f"{Colors.BLUE}Removed {removed}/{len(self.created)} benchmark files{Colors.END}")
+
+    def print_report(self):
+        for level in self.levels:
+            print(f"\n{Colors.BLUE}Upload Benchmark ({level} concurrent){Colors.END}")
+            print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+            print(f"{'Endpoint':<26}{'Reqs':>7}{'Req/s':>8}{'Err%':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+            for label, summary in self.summaries.get(level, {}).items():
+                color = Colors.RED if summary['errors'] else Colors.END
+                name = label if label == "edition" else f"/api{label}"
+                print(
+                    f"{color}{name:<26}{summary['requests']:>7}{summary['throughput']:>8.1f}"
+                    f"{summary['error_rate'] * 100:>6.1f}%{summary['p50_ms']:>9.1f}"
+                    f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}{Colors.END}"
+                )
+            for scenario, volume in self.volume.get(level, {}).items():
+                print(f"{scenario}: {volume['bytes'] / 1048576:.1f} MB in {volume['seconds']:.1f}s "
+                      f"({volume['mb_per_s']:.2f} MB/s)")
+
+        if "plasa-pages" in self.scenarios:
+            print(f"\n{Colors.BLUE}PLASA edition of {self.page_count} pages "
+                  f"({len(self.page_image) / 1024:.0f} KB/page){Colors.END}")
+            for level in self.levels:
+                edition = self.summaries[level]['edition']
+                per_page = edition['p50_ms'] / self.page_count
+                print(f"{level:>3} concurrent: p50 {edition['p50_ms'] / 1000:.2f}s per edition, "
+                      f"{per_page:.0f} ms per page")
+
+    def to_results(self):
+        """Results in the suite's format so runs can be exported and compared to a baseline"""
+        results = TestResults()
+        for level in self.levels:
+            summaries = dict(self.summaries.get(level, {}))
+            for scenario, volume in self.volume.get(level, {}).items():
+                summaries[f"{scenario} volume"] = volume
+            errors = sum(summary['errors'] for summary in summaries.values() if 'errors' in summary)
+            results.add_result(f"Uploads at concurrency {level}", errors == 0, f"{errors} failed requests")
+            results.add_benchmark(f"upload c={level}", summaries)
+        return results
+
+    def passed(self):
+        return all(
+            summary['errors'] == 0
+            for summaries in self.summaries.values()
+            for summary in summaries.values()
+        )
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Navy Display System - Upload Throughput Benchmark")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--concurrency", default="1,4,16", metavar="LEVELS",
+                        help="Comma-separated concurrency levels to measure (default: 1,4,16)")
+    parser.add_argument("--iterations", type=int, default=8, metavar="N",
+                        help="Operations per scenario and level; a PLASA edition counts as one (default: 8)")
+    parser.add_argument("--scenarios", default=",".join(UploadBenchmark.SCENARIOS), metavar="NAMES",
+                        help="Comma-separated scenarios: upload-pdf,plasa-pages,escala-cache")
+    parser.add_argument("--pages", type=int, default=20, metavar="N",
+                        help="Pages in the synthetic PLASA edition (default: 20)")
+    parser.add_argument("--pdf-page-bytes", type=int, default=150000, metavar="BYTES",
+                        help="Size of each synthetic PDF page (default: 150000)")
+    parser.add_argument("--page-bytes", type=int, default=350000, metavar="BYTES",
+                        help="Size of each rendered page image (default: 350000)")
+    parser.add_argument("--escala-bytes", type=int, default=600000, metavar="BYTES",
+                        help="Size of the escala image before base64 (default: 600000)")
+    parser.add_argument("--keep-files", action="store_true",
+                        help="Leave the uploaded benchmark files on the server")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and latency summaries to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    try:
+        levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    except ValueError:
+        parser.error("--concurrency takes comma-separated integers")
+    if not levels or min(levels) < 1:
+        parser.error("--concurrency levels must be at least 1")
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in UploadBenchmark.SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    print(f"{Colors.CYAN}Navy Display System - Upload Throughput Benchmark{Colors.END}")
+    print(f"{Colors.CYAN}{'='*50}{Colors.END}")
+
+    benchmark = UploadBenchmark(
+        args.base_url, levels, args.iterations, scenarios, args.pages, args.pdf_page_bytes,
+        page_bytes=args.page_bytes, escala_bytes=args.escala_bytes, keep_files=args.keep_files
+    )
+    benchmark.run()
+    benchmark.print_report()
+    if args.json:
+        benchmark.to_results().export_json(args.json)
+    sys.exit(0 if benchmark.passed() else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Navy Display System - View-State Synchronization Test
+N simulated displays post /api/documents/view-state at their cycle rate while M
+subscribers follow the documents stream; measures write throughput, how long
+subscribers disagree about a document's state and how the snapshot grows
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from sse_load_test import SseSubscriber, raise_fd_limit
+from test_selenium import Colors, LatencyStats, TestResults
+
+# Fixed ids so repeated runs overwrite the same view-state rows; the API has no way to delete them
+DOCUMENT_ID = "view-sync-test-{}"
+
+class ViewStateSyncTest:
+    """Concurrent view-state writers against stream subscribers, matched write by write"""
+
+    def __init__(self, base_url, writers=10, subscribers=20, documents=4, cycle=1.0, duration=30,
+                 settle=3.0, snapshot_sizes=None, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.api_url = f"{self.base_url}/api"
+        self.writers = writers
+        self.subscriber_count = subscribers
+        self.documents = documents
+        self.cycle = cycle
+        self.duration = duration
+        self.settle = settle
+        self.snapshot_sizes = sorted(snapshot_sizes or [])
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max(writers, 16))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(writers, 16))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # writes[(writer, seq)] = {'document', 'sent', 'acked', 'ok'}
+        self.writes = {}
+        self.write_stats = LatencyStats()
+        self.subscribers = []
+        # received[subscriber index] = [(arrived, document, writer, seq)]
+        self.received = []
+        self.snapshot_bytes = []
+        self.snapshot_sweep = []
+        self.elapsed = 0
+        self.results = TestResults()
+
+    # Subscribers
+
+    def _listener(self, index):
+        def on_event(arrived, event_type, data):
+            if event_type == "snapshot":
+                self.snapshot_bytes.append(len(data.encode()))
+            elif event_type == "view-state":
+                states = json.loads(data).get('viewStates') or {}
+                for document, state in states.items():
+                    # scrollLeft carries the writer and scrollTop the sequence number
+                    self.received[index].append(
+                        (arrived, document, int(state.get('scrollLeft', -1)), int(state.get('scrollTop', -1)))
+                    )
+        return on_event
+
+    async def _subscribe(self):
+        tasks = []
+        for index in range(self.subscriber_count):
+            self.received.append([])
+            subscriber = SseSubscriber(self.base_url, "documents", self._listener(index))
+            self.subscribers.append(subscriber)
+            tasks.append(asyncio.create_task(subscriber.run()))
+        deadline = time.perf_counter() + self.timeout
+        while time.perf_counter() < deadline:
+            if all(s.snapshot_seconds is not None or s.error for s in self.subscribers):
+                break
+            await asyncio.sleep(0.05)
+        return tasks
+
+    # Writers
+
+    def _post(self, document, writer, seq):
+        response = self.session.post(f"{self.api_url}/documents/view-state", json={
+            'documentId': document, 'zoom': 1, 'scrollTop': seq, 'scrollLeft': writer,
+        }, timeout=self.timeout)
+        return response.status_code < 400
+
+    async def _writer(self, writer, deadline):
+        """One display posting its view state every cycle, starting at a random phase like real screens"""
+        loop = asyncio.get_running_loop()
+        document = DOCUMENT_ID.format(writer % self.documents)
+        await asyncio.sleep(random.uniform(0, self.cycle))
+        seq = 0
+        while time.perf_counter() < deadline:
+            seq += 1
+            started = time.perf_counter()
+            write = self.writes[(writer, seq)] = {'document': document, 'sent': started, 'acked': None, 'ok': False}
+            try:
+                write['ok'] = await loop.run_in_executor(self.executor, self._post, document, writer, seq)
+            except requests.exceptions.RequestException:
+                pass
+            write['acked'] = time.perf_counter()
+            self.write_stats.add(write['acked'] - started, write['ok'])
+            await asyncio.sleep(max(0, self.cycle - (write['acked'] - started)))
+
+    async def run(self):
+        raise_fd_limit()
+        tasks = await self._subscribe()
+        try:
+            started = time.perf_counter()
+            deadline = started + self.duration
+            await asyncio.gather(*(self._writer(writer, deadline) for writer in range(self.writers)))
+            self.elapsed = time.perf_counter() - started
+            await asyncio.sleep(self.settle)
+        finally:
+            for subscriber in self.subscribers:
+                subscriber.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self.snapshot_sizes:
+            await self.sweep_snapshots()
+        self.executor.shutdown()
+        self.evaluate()
+
+    async def sweep_snapshots(self):
+        """Grow the number of stored view states and measure what a newly connecting display downloads"""
+        loop = asyncio.get_running_loop()
+        stored = self.documents
+        for size in self.snapshot_sizes:
+            if size > stored:
+                await asyncio.gather(*(
+                    loop.run_in_executor(self.executor, self._post, DOCUMENT_ID.format(index), 0, 0)
+                    for index in range(stored, size)
+                ))
+                stored = size
+            sizes = []
+            subscriber = SseSubscriber(self.base_url, "documents",
+                                       lambda arrived, event_type, data: sizes.append(len(data.encode())))
+            task = asyncio.create_task(subscriber.run())
+            deadline = time.perf_counter() + self.timeout
+            while subscriber.snapshot_seconds is None and not task.done() and time.perf_counter() < deadline:
+                await asyncio.sleep(0.01)
+            subscriber.close()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            listing = await loop.run_in_executor(
+                self.executor, lambda: len(self.session.get(f"{self.api_url}/documents/view-state", timeout=30).content)
+            )
+            self.snapshot_sweep.append({
+                'view_states': size,
+                'snapshot_bytes': sizes[0] if sizes else None,
+                'snapshot_ms': subscriber.snapshot_seconds * 1000 if subscriber.snapshot_seconds else None,
+                'get_view_state_bytes': listing,
+            })
+
+    # Analysis
+
+    def evaluate(self):
+        lag = LatencyStats()
+        spread = LatencyStats()
+        missing = out_of_order = 0
+        live = [index for index, s in enumerate(self.subscribers) if s.snapshot_seconds is not None and not s.error]
+
+        # First arrival of every write at every subscriber, and per-writer ordering
+        arrivals = {}
+        for index in live:
+            last_seq = {}
+            for arrived, document, writer, seq in self.received[index]:
+                arrivals.setdefault((writer, seq), {}).setdefault(index, arrived)
+                if seq < last_seq.get(writer, 0):
+                    out_of_order += 1
+                last_seq[writer] = max(seq, last_seq.get(writer, 0))
+
+        for key, write in self.writes.items():
+            if not write['ok']:
+                continue
+            seen = arrivals.get(key, {})
+            missing += len(live) - len(seen)
+            for arrived in seen.values():
+                lag.add(arrived - write['sent'])
+            if len(seen) == len(live) and seen:
+                # How long some displays showed the new state while others still had the old one
+                spread.add(max(seen.values()) - min(seen.values()))
+
+        self.summaries = {
+            'write': self.write_stats.summary(self.elapsed),
+            'delivery': lag.summary(self.elapsed),
+            'out_of_sync': spread.summary(self.elapsed),
+            'missing': missing,
+            'out_of_order': out_of_order,
+            'snapshot_bytes': max(self.snapshot_bytes) if self.snapshot_bytes else None,
+        }
+        write = self.summaries['write']
+        self.results.add_result(
+            "View State: writes", write['errors'] == 0,
+            f"{write['throughput']:.1f}/s, p95 {write['p95_ms']:.0f} ms, {write['errors']} failed"
+        )
+        self.results.add_result(
+            "View State: delivery", missing == 0 and len(live) == self.subscriber_count,
+            f"{len(live)}/{self.subscriber_count} subscribers, {missing} updates missing"
+        )
+        self.results.add_result(
+            "View State: ordering", out_of_order == 0, f"{out_of_order} updates arrived after a newer one"
+        )
+        self.results.add_benchmark("view-state-sync", dict(self.summaries, snapshot_sweep=self.snapshot_sweep))
+
+    def print_report(self):
+        print(f"\n{Colors.BLUE}View-State Sync ({self.writers} writers, {self.subscriber_count} subscribers, "
+              f"{self.documents} documents, {self.cycle:g}s cycle){Colors.END}")
+        print(f"{Colors.BLUE}{'='*30}{Colors.END}")
+        print(f"{'Measure':<24}{'Count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for label, key in (("POST view-state", 'write'), ("write -> subscriber", 'delivery'),
+                           ("out-of-sync window", 'out_of_sync')):
+            summary = self.summaries[key]
+            print(f"{label:<24}{summary['requests']:>7}{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}"
+                  f"{summary['p99_ms']:>9.1f}{summary['max_ms']:>9.1f}")
+        print(f"Write throughput: {self.summaries['write']['throughput']:.1f}/s")
+        if self.summaries['snapshot_bytes'] is not None:
+            print(f"Snapshot on connect: {self.summaries['snapshot_bytes'] / 1024:.1f} KB")
+
+        if self.snapshot_sweep:
+            print(f"\n{Colors.BLUE}Snapshot Size by Stored View States{Colors.END}")
+            print(f"{Colors.BLUE}{'='*20}{Colors.END}")
+            print(f"{'States':>8}{'Snapshot KB':>13}{'Snapshot ms':>13}{'GET KB':>9}")
+            for row in self.snapshot_sweep:
+                snapshot_kb = "-" if row['snapshot_bytes'] is None else f"{row['snapshot_bytes'] / 1024:.1f}"
+                snapshot_ms = "-" if row['snapshot_ms'] is None else f"{row['snapshot_ms']:.0f}"
+                print(f"{row['view_states']:>8}{snapshot_kb:>13}{snapshot_ms:>13}"
+                      f"{row['get_view_state_bytes'] / 1024:>9.1f}")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Navy Display System - View-State Synchronization Test. Writes view states under "
+                    "fixed view-sync-test-N ids, which the API cannot delete; reruns overwrite them."
+    )
+    parser.add_argument("base_url", nargs="?", default="http://localhost:5000",
+                        help="Display server URL (default: http://localhost:5000)")
+    parser.add_argument("--writers", type=int, default=10, metavar="N",
+                        help="Simulated displays posting view states (default: 10)")
+    parser.add_argument("--subscribers", type=int, default=20, metavar="M",
+                        help="Documents stream subscribers (default: 20)")
+    parser.add_argument("--documents", type=int, default=4, metavar="K",
+                        help="Documents the writers share; fewer means more contention (default: 4)")
+    parser.add_argument("--cycle", type=float, default=1.0, metavar="SECONDS",
+                        help="Seconds between one display's view-state posts (default: 1)")
+    parser.add_argument("--duration", type=float, default=30, metavar="SECONDS",
+                        help="How long the writers run (default: 30)")
+    parser.add_argument("--snapshot-sizes", metavar="LIST",
+                        help="Afterwards, grow the stored view states to each size and measure the snapshot, "
+                             "e.g. 10,100,1000")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Write results and summaries to a JSON file (see test_selenium.py --compare)")
+    args = parser.parse_args()
+
+    if min(args.writers, args.subscribers, args.documents) < 1:
+        parser.error("--writers, --subscribers and --documents must be at least 1")
+    try:
+        snapshot_sizes = [int(size) for size in args.snapshot_sizes.split(",")] if args.snapshot_sizes else None
+    except ValueError:
+        parser.error("--snapshot-sizes takes comma-separated integers")
+
+    print(f"{Colors.CYAN}Navy Display System - View-State Synchronization Test{Colors.END}")
+    print(f"{Colors.CYAN}{'='*53}{Colors.END}")
+
+    test = ViewStateSyncTest(
+        args.base_url, args.writers, args.subscribers, args.documents, args.cycle, args.duration,
+        snapshot_sizes=snapshot_sizes
+    )
+    asyncio.run(test.run())
+    test.print_report()
+    test.results.print_summary()
+    if args.json:
+        test.results.export_json(args.json)
+    sys.exit(0 if test.results.failed == 0 else 1)
+
+if __name__ == "__main__":
+    main()